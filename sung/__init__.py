@@ -120,6 +120,8 @@ from sung.base import (
     Tracks,
     PlaylistReader,
     Playlist,
+    TrackStore,
+    load_playlists,
     extract_extra_metadata,
     df_extract_extra_metadata,
     SpotifyDacc,
@@ -132,17 +134,34 @@ from sung.util import (
     get_spotify_client,
     ensure_playlist_id,
 )
+from sung.clients import ClientRegistry, client_registry, pooled_client
+from sung.tokens import SharedTokenCache
+from sung.caching import (
+    SearchCache,
+    enable_search_cache,
+    disable_search_cache,
+    ResolutionMemo,
+    enable_resolution_memo,
+)
+from sung.search import iter_search, search_many, iter_search_many, search_multi
+from sung.id_index import IdIndex, enable_id_index, lookup_isrcs, lookup_upcs
+from sung.throttle import RateLimitScheduler, scheduler
 from sung.tools import TracksAnalysis
 from sung.chords_and_lyrics import (
     render_chords_and_lyrics,
     search_songs,
+    get_lyrics_and_chords_dataset,
     remove_non_lyrics,
     pack_song_text,
 )
+from sung.song_tables import iter_song_table
 from sung.playlists import (
     parse_song_descriptor,
     resolve_song,
     resolve_songs,
     playlist_from_songs,
     SongMatch,
+    LocalResolver,
+    CandidateScorer,
+    ScoringWeights,
 )
@@ -0,0 +1,623 @@
+"""Asyncio counterparts of the sung Spotify tools.
+
+`sung.base` sits on spotipy's blocking ``requests`` session. This module offers an
+asyncio-native transport, `AsyncSpotify`, covering the endpoints sung uses, and
+async versions of `Tracks`, `PlaylistReader`, `Playlist` and `search_tracks` built
+on it. Concurrency is bounded by the transport (see ``max_concurrency``).
+
+Requires ``httpx`` (``pip install httpx``, or ``pip install sung[async]``).
+
+Example::
+
+    >>> import asyncio
+    >>> from sung.aio import AsyncSpotify, AsyncPlaylistReader
+    >>> async def main():
+    ...     async with AsyncSpotify() as client:
+    ...         reader = AsyncPlaylistReader('37i9dQZEVXbMDoHDwVN2tF', client=client)
+    ...         return await reader.track_metas()
+    >>> track_metas = asyncio.run(main())  # doctest: +SKIP
+
+The transport talks to ``prefix`` (the Spotify Web API by default), so it can be
+pointed to a local stand-in server, with a fixed ``access_token``, for testing.
+Here, one answering searches with a track named after the query:
+
+    >>> import pytest; httpx = pytest.importorskip('httpx')  # pip install sung[async]
+    >>> import json, threading
+    >>> from http.server import BaseHTTPRequestHandler, HTTPServer
+    >>> from urllib.parse import urlparse, parse_qs
+    >>> class StandIn(BaseHTTPRequestHandler):
+    ...     def do_GET(self):
+    ...         (query,) = parse_qs(urlparse(self.path).query)['q']
+    ...         items = [{'id': '4uLU6hMCjMI75M1A2tKUQC', 'name': query}]
+    ...         body = json.dumps({'tracks': {'items': items}}).encode()
+    ...         self.send_response(200)
+    ...         self.send_header('Content-Type', 'application/json')
+    ...         self.end_headers()
+    ...         self.wfile.write(body)
+    ...     def log_message(self, *args):
+    ...         pass
+    >>> server = HTTPServer(('127.0.0.1', 0), StandIn)
+    >>> threading.Thread(target=server.serve_forever, daemon=True).start()
+    >>> async def search():
+    ...     prefix = f'http://127.0.0.1:{server.server_port}/v1/'
+    ...     async with AsyncSpotify(access_token='test', prefix=prefix) as client:
+    ...         return await async_search_tracks('Clocks', year=2002, client=client)
+    >>> asyncio.run(search())
+    [{'id': '4uLU6hMCjMI75M1A2tKUQC', 'name': 'Clocks year:2002'}]
+    >>> server.shutdown()
+
+"""
+
+import asyncio
+import contextlib
+import time
+from typing import Any
+from collections.abc import Callable, Iterable, Sequence
+
+from spotipy.exceptions import SpotifyException
+
+from sung.util import (
+    DFLT_LIMIT,
+    SearchTypeT,
+    TrackId,
+    TrackMetadata,
+    cast_track_key,
+    ensure_track_id,
+    ensure_playlist_id,
+    extractor,
+    ensure_client,
+)
+from sung.clients import pooled_client
+from sung.throttle import (
+    RateLimitScheduler,
+    retry_after_seconds,
+    scheduler as default_scheduler,
+)
+
+DFLT_API_PREFIX = "https://api.spotify.com/v1/"
+DFLT_MAX_CONCURRENCY = 8
+DFLT_REQUESTS_TIMEOUT = 5
+DFLT_RETRIES = 3
+# A token obtained from an auth manager is reused until this many seconds before it
+# expires (its expiry being read from the auth manager's token cache).
+DFLT_TOKEN_EXPIRY_MARGIN = 30
+# How long a token is reused when its expiry can't be known. spotipy's auth managers
+# only hand out a cached token if it has more than a minute left, so this is safe.
+DFLT_TOKEN_TTL = 45
+
+
+def _chunks(seq: Sequence, size: int):
+    return (seq[i : i + size] for i in range(0, len(seq), size))
+
+
+class AsyncSpotify:
+    """An asyncio transport for the Spotify Web API endpoints sung uses.
+
+    Parameters:
+        - auth_manager: A spotipy auth manager to get access tokens from. If neither
+          this nor ``access_token`` is given, the auth manager of
+          ``get_spotify_client()`` is used.
+        - access_token: A fixed access token (handy for tests and stand-in servers).
+        - prefix: The base url of the API.
+        - max_concurrency: The maximum number of requests in flight at once.
+        - requests_timeout: Timeout of each request, in seconds.
+        - retries: How many times to retry a request that was rate limited (429)
+          or failed with a 5xx status.
+        - http_client: An existing ``httpx.AsyncClient`` to use.
+        - scheduler: The `RateLimitScheduler` requests go through (the process-wide
+          ``sung.throttle.scheduler`` by default; None for none). It, rather than
+          this transport, then handles the waiting on 429 responses.
+    """
+
+    def __init__(
+        self,
+        auth_manager: Any = None,
+        *,
+        access_token: str | None = None,
+        prefix: str = DFLT_API_PREFIX,
+        max_concurrency: int = DFLT_MAX_CONCURRENCY,
+        requests_timeout: float = DFLT_REQUESTS_TIMEOUT,
+        retries: int = DFLT_RETRIES,
+        language: str | None = None,
+        http_client: Any = None,
+        scheduler: RateLimitScheduler | None = default_scheduler,
+    ):
+        if auth_manager is None and access_token is None:
+            auth_manager = ensure_client(None).auth_manager
+        self.auth_manager = auth_manager
+        self.prefix = prefix if prefix.endswith("/") else prefix + "/"
+        self.max_concurrency = max_concurrency
+        self.requests_timeout = requests_timeout
+        self.retries = retries
+        self.language = language
+        self._access_token = access_token
+        self._token_expires_at = float("inf") if access_token else 0.0
+        self._http_client = http_client
+        self.scheduler = scheduler
+        self._semaphore = None  # made lazily, so it binds to the running loop
+
+    @classmethod
+    def from_client(cls, client, **kwargs) -> "AsyncSpotify":
+        """Make an async transport sharing the auth manager of a spotipy client."""
+        return cls(client.auth_manager, **kwargs)
+
+    @property
+    def http_client(self):
+        if self._http_client is None:
+            import httpx  # pip install httpx
+
+            self._http_client = httpx.AsyncClient(timeout=self.requests_timeout)
+        return self._http_client
+
+    async def aclose(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _scheduler_slot(self):
+        if self.scheduler is None:
+            return contextlib.nullcontext()
+        return self.scheduler.aslot()
+
+    def _fetch_token(self) -> tuple[str, float]:
+        """Get an access token from the auth manager, and the time to stop using it."""
+        try:
+            token = self.auth_manager.get_access_token(as_dict=False)
+        except TypeError:
+            token = self.auth_manager.get_access_token()
+        cache_handler = getattr(self.auth_manager, "cache_handler", None)
+        token_info = cache_handler.get_cached_token() if cache_handler else None
+        if token_info and token_info.get("access_token") == token:
+            if expires_at := token_info.get("expires_at"):
+                return token, expires_at - DFLT_TOKEN_EXPIRY_MARGIN
+        return token, time.time() + DFLT_TOKEN_TTL
+
+    async def _token(self) -> str:
+        if self._access_token is None or time.time() >= self._token_expires_at:
+            # Auth managers are blocking (and may even prompt the user), so they
+            # run in a thread; this only happens when the token is about to expire.
+            token, expires_at = await asyncio.to_thread(self._fetch_token)
+            self._access_token, self._token_expires_at = token, expires_at
+        return self._access_token
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict | None = None,
+        payload: Any = None,
+    ) -> Any:
+        if not url.startswith("http"):
+            url = self.prefix + url
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        token_refreshed = False
+        attempt = 0
+        while True:
+            headers = {
+                "Authorization": f"Bearer {await self._token()}",
+                "Content-Type": "application/json",
+            }
+            if self.language is not None:
+                headers["Accept-Language"] = self.language
+            async with self._semaphore, self._scheduler_slot():
+                response = await self.http_client.request(
+                    method, url, params=params, json=payload, headers=headers
+                )
+            status = response.status_code
+            if status == 401 and self.auth_manager is not None and not token_refreshed:
+                # The token expired (or was revoked) early: get a new one, once (not
+                # counted as one of the retries, which are for 429s and 5xxs)
+                self._access_token, token_refreshed = None, True
+                continue
+            if self.scheduler is not None:
+                if status == 429:
+                    self.scheduler.on_throttled(retry_after_seconds(response.headers))
+                elif status < 400:
+                    self.scheduler.on_success()
+            if (status == 429 or status >= 500) and attempt < self.retries:
+                if status >= 500 or self.scheduler is None:
+                    # (on a 429, the scheduler makes the next slot wait)
+                    delay = retry_after_seconds(response.headers, 2**attempt)
+                    await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            break
+
+        if status >= 400:
+            try:
+                error = response.json().get("error", {})
+                msg, reason = error.get("message"), error.get("reason")
+            except ValueError:
+                msg, reason = response.text or None, None
+            raise SpotifyException(
+                status,
+                -1,
+                f"{response.url}:\n {msg}",
+                reason=reason,
+                headers=response.headers,
+            )
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    # ----------------------------------------------------------------------------------
+    # Endpoints (named and parametrized like their spotipy.Spotify counterparts)
+
+    async def me(self) -> dict:
+        return await self._request("GET", "me")
+
+    async def track(self, track_id: str, market: str | None = None) -> dict:
+        track_id = ensure_track_id(track_id)
+        return await self._request(
+            "GET", f"tracks/{track_id}", params={"market": market}
+        )
+
+    async def tracks(self, tracks: Iterable[str], market: str | None = None) -> dict:
+        """Get many tracks. Unlike spotipy, any number of tracks can be asked for:
+        they are fetched in concurrent batches of 50."""
+        track_ids = [ensure_track_id(t) for t in tracks]
+        responses = await asyncio.gather(
+            *(
+                self._request(
+                    "GET", "tracks", params={"ids": ",".join(ids), "market": market}
+                )
+                for ids in _chunks(track_ids, 50)
+            )
+        )
+        return {"tracks": [t for r in responses for t in r["tracks"]]}
+
+    async def playlist_items(
+        self,
+        playlist_id: str,
+        fields: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        market: str | None = None,
+        additional_types: Sequence[str] = ("track", "episode"),
+    ) -> dict:
+        playlist_id = ensure_playlist_id(playlist_id)
+        return await self._request(
+            "GET",
+            f"playlists/{playlist_id}/tracks",
+            params={
+                "fields": fields,
+                "limit": limit,
+                "offset": offset,
+                "market": market,
+                "additional_types": ",".join(additional_types),
+            },
+        )
+
+    async def search(
+        self,
+        q: str,
+        limit: int = 10,
+        offset: int = 0,
+        type: str = "track",
+        market: str | None = None,
+    ) -> dict:
+        return await self._request(
+            "GET",
+            "search",
+            params={
+                "q": q,
+                "limit": limit,
+                "offset": offset,
+                "type": type,
+                "market": market,
+            },
+        )
+
+    async def audio_features(self, tracks: Iterable[str]) -> list:
+        track_ids = [ensure_track_id(t) for t in tracks]
+        responses = await asyncio.gather(
+            *(
+                self._request("GET", "audio-features", params={"ids": ",".join(ids)})
+                for ids in _chunks(track_ids, 100)
+            )
+        )
+        return [f for r in responses for f in (r or {}).get("audio_features", [])]
+
+    async def audio_analysis(self, track_id: str) -> dict:
+        track_id = ensure_track_id(track_id)
+        return await self._request("GET", f"audio-analysis/{track_id}")
+
+    async def user_playlist_create(
+        self,
+        user: str,
+        name: str,
+        public: bool = True,
+        collaborative: bool = False,
+        description: str = "",
+    ) -> dict:
+        return await self._request(
+            "POST",
+            f"users/{user}/playlists",
+            payload={
+                "name": name,
+                "public": public,
+                "collaborative": collaborative,
+                "description": description,
+            },
+        )
+
+    async def playlist_add_items(
+        self, playlist_id: str, items: Iterable[str], position: int | None = None
+    ) -> dict:
+        playlist_id = ensure_playlist_id(playlist_id)
+        payload = {"uris": [cast_track_key(item, "uri") for item in items]}
+        if position is not None:
+            payload["position"] = position
+        return await self._request(
+            "POST", f"playlists/{playlist_id}/tracks", payload=payload
+        )
+
+    async def playlist_remove_all_occurrences_of_items(
+        self, playlist_id: str, items: Iterable[str], snapshot_id: str | None = None
+    ) -> dict:
+        playlist_id = ensure_playlist_id(playlist_id)
+        payload = {"tracks": [{"uri": cast_track_key(item, "uri")} for item in items]}
+        if snapshot_id:
+            payload["snapshot_id"] = snapshot_id
+        return await self._request(
+            "DELETE", f"playlists/{playlist_id}/tracks", payload=payload
+        )
+
+
+# --------------------------------------------------------------------------------------
+# Async Tracks, PlaylistReader, Playlist and search
+
+
+def _ensure_async_client(client) -> AsyncSpotify:
+    if client is None:
+        return AsyncSpotify()
+    if isinstance(client, AsyncSpotify):
+        return client
+    return AsyncSpotify.from_client(client)  # assume it's a (sync) spotipy client
+
+
+class AsyncTracks:
+    """Async counterpart of `sung.base.Tracks`.
+
+    Holds track ids or track metadata; metadata is fetched (concurrently, in batches)
+    on the first ``await tracks.track_metas()``.
+    """
+
+    def __init__(
+        self,
+        tracks: Iterable[TrackId | TrackMetadata],
+        *,
+        client: AsyncSpotify | None = None,
+    ):
+        self.client = _ensure_async_client(client)
+        tracks = list(tracks)
+        self._track_ids = None
+        self._track_metas = None
+        if tracks and isinstance(tracks[0], dict):
+            self._track_metas = tracks
+        else:
+            self._track_ids = [ensure_track_id(t) for t in tracks]
+        self._audio_analyses = {}
+
+    @property
+    def track_ids(self) -> list[TrackId]:
+        if self._track_ids is None:
+            self._track_ids = [meta["id"] for meta in self._track_metas]
+        return self._track_ids
+
+    async def track_metas(self) -> list[TrackMetadata]:
+        if self._track_metas is None:
+            from sung.base import _notify_track_metas_observers
+
+            response = await self.client.tracks(self._track_ids)
+            self._track_metas = response["tracks"]
+            _notify_track_metas_observers([m for m in self._track_metas if m])
+        return self._track_metas
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+    def __contains__(self, key: TrackId) -> bool:
+        return key in set(self.track_ids)
+
+    async def __aiter__(self):
+        for track_meta in await self.track_metas():
+            yield track_meta
+
+    async def get(self, key: TrackId | int) -> TrackMetadata:
+        """Get the metadata of a track, by id or index."""
+        track_metas = await self.track_metas()
+        if isinstance(key, int):
+            return track_metas[key % len(track_metas)]
+        if key not in self:
+            raise KeyError(key)
+        return track_metas[self.track_ids.index(key)]
+
+    async def audio_features(self) -> dict:
+        """Track-level audio features keyed by track id (see `Tracks.audio_features`)."""
+        features = await self.client.audio_features(self.track_ids)
+        return dict(zip(self.track_ids, features))
+
+    async def audio_analysis(self, key: TrackId) -> dict:
+        track_id = ensure_track_id(key)
+        if track_id not in self._audio_analyses:
+            self._audio_analyses[track_id] = await self.client.audio_analysis(track_id)
+        return self._audio_analyses[track_id]
+
+    async def meta_dataframe(self):
+        """The tracks' metadata as a `Tracks.meta_dataframe` would give it."""
+        from sung.base import Tracks
+
+        track_metas = await self.track_metas()
+        # The (sync) client is never used, since all metadata is already there
+        return Tracks(track_metas, client=self.client).meta_dataframe()
+
+    @classmethod
+    async def search(cls, query: str, **search_kwargs) -> "AsyncTracks":
+        client = _ensure_async_client(search_kwargs.pop("client", None))
+        track_metas = await async_search_tracks(query, client=client, **search_kwargs)
+        return cls(track_metas, client=client)
+
+
+class AsyncPlaylistReader(AsyncTracks):
+    """Async counterpart of `sung.base.PlaylistReader`.
+
+    The first page of the playlist is fetched alone (to learn its total); the
+    remaining pages are then all fetched concurrently.
+    """
+
+    page_size = 100
+
+    def __init__(self, playlist_id: str, *, client: AsyncSpotify | None = None):
+        self.client = _ensure_async_client(client)
+        self.playlist_id = ensure_playlist_id(playlist_id)
+        self._track_ids = None
+        self._track_metas = None
+        self._audio_analyses = {}
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}("{self.playlist_id}")'
+
+    @property
+    def playlist_url(self) -> str:
+        return f"https://open.spotify.com/playlist/{self.playlist_id}"
+
+    @property
+    def track_ids(self) -> list[TrackId]:
+        if self._track_metas is None:
+            raise ValueError(
+                "Playlist not fetched yet: await the track_metas() method first"
+            )
+        return super().track_ids
+
+    async def _fetch_page(self, offset: int) -> dict:
+        return await self.client.playlist_items(
+            self.playlist_id,
+            offset=offset,
+            limit=self.page_size,
+            fields="items.track,next,total",
+        )
+
+    async def track_metas(self) -> list[TrackMetadata]:
+        if self._track_metas is None:
+            from sung.base import _notify_track_metas_observers
+
+            first_page = await self._fetch_page(0)
+            total = first_page.get("total") or 0
+            other_pages = await asyncio.gather(
+                *(
+                    self._fetch_page(offset)
+                    for offset in range(self.page_size, total, self.page_size)
+                )
+            )
+            self._track_metas = [
+                item["track"]
+                for page in (first_page, *other_pages)
+                for item in page["items"]
+                if item["track"]
+            ]
+            self._track_ids = None
+            _notify_track_metas_observers(self._track_metas)
+        return self._track_metas
+
+    def _invalidate_cache(self) -> None:
+        self._track_metas = None
+        self._track_ids = None
+
+
+class AsyncPlaylist(AsyncPlaylistReader):
+    """Async counterpart of `sung.base.Playlist`."""
+
+    async def add_songs(self, track_list: TrackId | Iterable[TrackId]) -> None:
+        if isinstance(track_list, str):
+            track_list = [track_list]
+        track_list = list(track_list)
+        # Batches are added one after the other, so that the playlist keeps their order
+        for batch in _chunks(track_list, 100):
+            await self.client.playlist_add_items(self.playlist_id, batch)
+        self._invalidate_cache()
+
+    async def delete_songs(self, track_list: TrackId | Iterable[TrackId]) -> None:
+        if isinstance(track_list, str):
+            track_list = [track_list]
+        track_list = list(track_list)
+        await asyncio.gather(
+            *(
+                self.client.playlist_remove_all_occurrences_of_items(
+                    self.playlist_id, batch
+                )
+                for batch in _chunks(track_list, 100)
+            )
+        )
+        self._invalidate_cache()
+
+    async def extend(self, track_list: Iterable[TrackId]) -> None:
+        await self.add_songs(track_list)
+
+    async def append(self, track_id: TrackId) -> None:
+        await self.extend([track_id])
+
+    @classmethod
+    async def create_from_track_list(
+        cls,
+        track_list: Sequence[TrackId] = (),
+        playlist_name: str = "New Playlist",
+        public: bool = True,
+        *,
+        client: AsyncSpotify | None = None,
+        user_id=None,
+    ) -> "AsyncPlaylist":
+        """Create a new playlist from a list of track IDs.
+
+        See `sung.base.Playlist.create_from_track_list`.
+        """
+        if client is None:
+            scope = "playlist-modify-public playlist-modify-private"
+            client = AsyncSpotify(pooled_client(ensure_scope=scope).auth_manager)
+        client = _ensure_async_client(client)
+        if user_id is None:
+            user_id = (await client.me())["id"]
+        playlist = await client.user_playlist_create(
+            user=user_id, name=playlist_name, public=public
+        )
+        self = cls(playlist["id"], client=client)
+        await self.add_songs([cast_track_key(t, "uri") for t in track_list])
+        return self
+
+
+async def async_search_tracks(
+    query: str,
+    egress: Callable = extractor("tracks.items"),
+    *,
+    search_type: SearchTypeT = "track",
+    market=None,
+    year=None,
+    genre=None,
+    limit: int = DFLT_LIMIT,
+    offset: int = 0,
+    client: AsyncSpotify | None = None,
+):
+    """Async counterpart of `sung.base.search_tracks`."""
+    from sung.base import search_query_string
+
+    client = _ensure_async_client(client)
+    query_string = search_query_string(query, year=year, genre=genre)
+    results = await client.search(
+        q=query_string, type=search_type, market=market, limit=limit, offset=offset
+    )
+    if track_metas := (results.get("tracks") or {}).get("items"):
+        from sung.base import _notify_track_metas_observers
+
+        _notify_track_metas_observers(track_metas)
+    return egress(results)
@@ -8,12 +8,14 @@ with Spotify's API and streamline data extraction and manipulation.
 Key Components:
 
 - `search_tracks`: A function to perform searches on Spotify, supporting filters such
-  as year, genre, and market.
+  as year, genre, and market, and caching of responses (see `sung.caching`).
 - `TracksBase`: A base class for managing collections of Spotify tracks,
   providing a dictionary-like interface with additional utilities for metadata handling.
 - `Tracks`: A concrete implementation of `TracksBase` that uses track IDs or track metadata.
 - `PlaylistReader` and `Playlist`: Classes for managing Spotify playlists, offering
   read-only and mutable interfaces respectively.
+- `TrackStore` and `load_playlists`: Bulk loading of many playlists, concurrently,
+  with tracks deduplicated into one shared store.
 - Utility functions and constants for managing Spotify clients and data extraction.
 
 This module is foundational for building higher-level operations within the sung package.
@@ -25,12 +27,16 @@ from typing import (
     List,
     Any,
     Dict,
+    NamedTuple,
 )
 from collections.abc import Iterable, Sequence, Callable, MutableMapping, Mapping
 from operator import itemgetter
 from functools import cached_property, lru_cache
 from collections.abc import Mapping
 from abc import ABC
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import threading
 
 import pandas as pd
 
@@ -42,6 +48,7 @@ from sung.util import (
     convert_date,
     cast_track_key,
     ensure_track_id,
+    ensure_playlist_id,
     SearchTypeT,
     TrackId,
     TrackRef,
@@ -54,6 +61,18 @@ from sung.util import (
     spotify_audio_features_fields,
     spotify_track_metadata_numerical_field_names,
 )
+from sung.clients import client_registry, pooled_client
+from sung.caching import SearchCache, resolve_search_cache
+from sung.playlist_ops import (
+    bulk_add_items,
+    apply_op,
+    plan_moves,
+    plan_sync,
+    playlist_state,
+    RemoveOp,
+    send_ops,
+    ProgressCallback,
+)
 
 DFLT_VERBOSE = True
 
@@ -105,10 +124,35 @@ def process_track_columns(df):
 TrackKeySpec = Union[TrackId, int, slice, Iterable[TrackId]]
 
 
-def track_ids_to_metas(track_ids, client):
-    """Convert track IDs to track metadata using the Spotify client."""
-    response = client.tracks(track_ids)
-    return response["tracks"]
+# Functions called with the lists of track metadata fetched from Spotify (by tracks,
+# playlist readers and track searches; see, for example,
+# `sung.id_index.enable_id_index`)
+track_metas_observers: list[Callable[[list[TrackMetadata]], None]] = []
+
+
+def _notify_track_metas_observers(track_metas: list[TrackMetadata]) -> None:
+    """Hand fetched track metadata to the observers. An observer failing (say, its
+    index file is locked) is warned about, but doesn't fail the fetch."""
+    import warnings
+
+    for observer in track_metas_observers:
+        try:
+            observer(track_metas)
+        except Exception as error:
+            warnings.warn(f"Track metadata observer {observer!r} failed: {error!r}")
+
+
+def track_ids_to_metas(track_ids, client, *, chunk_size=50):
+    """Convert track IDs to track metadata using the Spotify client.
+
+    Ids are requested in chunks of ``chunk_size`` (the API's maximum is 50).
+    """
+    track_ids = list(track_ids)
+    track_metas = []
+    for i in range(0, len(track_ids), chunk_size):
+        response = client.tracks(track_ids[i : i + chunk_size])
+        track_metas.extend(response["tracks"])
+    return track_metas
 
 
 def track_metas_to_track_ids(track_metas):
@@ -130,9 +174,7 @@ class TracksBase(Mapping[TrackId, TrackMetadata]):
         # track_metas: Optional[Iterable[TrackMetadata]] = None,
         client: Any | None = None,
     ):
-        if client is None:
-            client = get_spotify_client()
-        self.client = client
+        self.client = ensure_client(client)
 
         tracks = list(tracks)
 
@@ -169,6 +211,7 @@ class TracksBase(Mapping[TrackId, TrackMetadata]):
             return self._track_metas
         elif self._track_ids is not None:
             self._track_metas = track_ids_to_metas(self._track_ids, self.client)
+            _notify_track_metas_observers(self._track_metas)
             return self._track_metas
         else:
             raise ValueError("No track IDs or metadata available")
@@ -341,6 +384,7 @@ class Tracks(TracksBase):
         limit: int = DFLT_LIMIT,
         offset: int = 0,
         client: Any | None = None,
+        cache: SearchCache | bool | None = None,
     ):
         tracks = search_tracks(
             query=query,
@@ -352,6 +396,7 @@ class Tracks(TracksBase):
             limit=limit,
             offset=offset,
             client=client,
+            cache=cache,
         )
         track_metas = tracks
         return cls(track_metas, client=client)
@@ -375,6 +420,7 @@ def search_tracks(
     limit: int = DFLT_LIMIT,
     offset: int = 0,
     client=get_spotify_client,
+    cache: SearchCache | bool | None = None,
 ):
     """
     Search for tracks on Spotify.
@@ -386,37 +432,147 @@ def search_tracks(
         - market - An ISO 3166-1 alpha-2 country code or the string 'from_token'.
         - limit - the number of items to return.
         - offset - the index of the first item to return.
+        - cache - A `sung.caching.SearchCache` to get (and keep) the response from,
+                  True for the default one, or False for none. By default (None),
+                  the default cache is used if enabled (see
+                  `sung.caching.enable_search_cache`).
     """
     client = ensure_client(client)
+    query_string = search_query_string(query, year=year, genre=genre)
+    results = _cached_search(
+        client,
+        query_string,
+        search_type,
+        market=market,
+        limit=limit,
+        offset=offset,
+        cache=cache,
+    )
+    return egress(results)
+
+
+def search_query_string(query: str, *, year=None, genre=None) -> str:
+    """The query string of a search, with its ``year`` and ``genre`` qualifiers.
 
-    # Build query
+    >>> search_query_string('Love', year='1990-1999', genre='rock')
+    'Love year:1990-1999 genre:rock'
+    """
     query_string = query
     if year:
         query_string += f" year:{year}"
     if genre:
         query_string += f" genre:{genre}"
+    return query_string
+
 
-    # Execute search
+def _cached_search(
+    client,
+    query_string: str,
+    search_type: str,
+    *,
+    market=None,
+    limit: int = DFLT_LIMIT,
+    offset: int = 0,
+    cache: SearchCache | bool | None = None,
+) -> dict:
+    """Get the (raw) response of a search, from ``cache`` if there."""
+    cache = resolve_search_cache(cache)
+    if cache is not None:
+        key = cache.key(query_string, search_type, market, limit, offset)
+        results = cache.get(key)
+        if results is not None:
+            return results
     results = client.search(
         q=query_string, type=search_type, market=market, limit=limit, offset=offset
     )
-
-    return egress(results)
+    if track_metas := (results.get("tracks") or {}).get("items"):
+        _notify_track_metas_observers(track_metas)
+    if cache is not None:
+        cache.set(key, results)
+    return results
 
 
 # --------------------------------------------------------------------------------------
 # Playlist Classes
 
 
+DFLT_MAX_WORKERS = 8
+PLAYLIST_MODIFY_SCOPE = "playlist-modify-public playlist-modify-private"
+
+
+class TrackStore(MutableMapping[TrackId, TrackMetadata]):
+    """A thread-safe store of track metadata, keyed by track id, shared by readers.
+
+    Readers that are given the same store hand their fetched track metadata to it
+    through `intern_many`, which returns the store's canonical dict for every track
+    already seen. Tracks that appear in many playlists are then held only once.
+
+    >>> store = TrackStore()
+    >>> a = store.intern({'id': 'abc', 'name': 'Clocks'})
+    >>> b = store.intern({'id': 'abc', 'name': 'Clocks'})
+    >>> a is b, len(store)
+    (True, 1)
+    """
+
+    def __init__(self, track_metas: Iterable[TrackMetadata] = ()):
+        self._metas: dict[TrackId, TrackMetadata] = {}
+        self._lock = threading.Lock()
+        self.intern_many(track_metas)
+
+    def __getitem__(self, track_id: TrackId) -> TrackMetadata:
+        return self._metas[track_id]
+
+    def __setitem__(self, track_id: TrackId, track_meta: TrackMetadata) -> None:
+        with self._lock:
+            self._metas[track_id] = track_meta
+
+    def __delitem__(self, track_id: TrackId) -> None:
+        with self._lock:
+            del self._metas[track_id]
+
+    def __iter__(self) -> Iterable[TrackId]:
+        return iter(list(self._metas))
+
+    def __len__(self) -> int:
+        return len(self._metas)
+
+    def __contains__(self, track_id) -> bool:
+        return track_id in self._metas
+
+    def intern(self, track_meta: TrackMetadata) -> TrackMetadata:
+        """Return the stored metadata for this track, storing it if it's new.
+
+        Tracks without an id (e.g. local files) are returned as is.
+        """
+        track_id = track_meta.get("id")
+        if track_id is None:
+            return track_meta
+        with self._lock:
+            return self._metas.setdefault(track_id, track_meta)
+
+    def intern_many(self, track_metas: Iterable[TrackMetadata]) -> list[TrackMetadata]:
+        return [self.intern(track_meta) for track_meta in track_metas]
+
+
 # TODO: Make it a subclass of TracksBase, or Tracks
 class PlaylistReader(Tracks, Mapping[TrackId, TrackMetadata]):
-    """Read-only access to a Spotify playlist."""
+    """Read-only access to a Spotify playlist.
 
-    def __init__(self, playlist_id: str, *, client: Any | None = None):
-        if client is None:
-            client = get_spotify_client()
-        self.client = client
+    If a `track_store` is given, fetched track metadata is deduplicated into it,
+    so that many readers sharing a store hold a single copy of common tracks
+    (see `load_playlists`).
+    """
+
+    def __init__(
+        self,
+        playlist_id: str,
+        *,
+        client: Any | None = None,
+        track_store: TrackStore | None = None,
+    ):
+        self.client = ensure_client(client)
         self.playlist_id = playlist_id
+        self.track_store = track_store
         self._tracks: Tracks | None = None  # Will be a Tracks instance
 
     def __repr__(self) -> str:
@@ -426,6 +582,9 @@ class PlaylistReader(Tracks, Mapping[TrackId, TrackMetadata]):
     def tracks(self) -> Tracks:
         if self._tracks is None:
             track_metas = self._fetch_track_metas()
+            _notify_track_metas_observers(track_metas)
+            if self.track_store is not None:
+                track_metas = self.track_store.intern_many(track_metas)
             self._tracks = Tracks(tracks=track_metas, client=self.client)
         return self._tracks
 
@@ -452,6 +611,31 @@ class PlaylistReader(Tracks, Mapping[TrackId, TrackMetadata]):
             offset += limit
         return track_metas
 
+    def _fetch_track_ids(self) -> list[TrackId | None]:
+        """Fetch only the ids of the playlist's items, in order.
+
+        Unlike `tracks`, items without a track id (e.g. local files) are kept, as
+        ``None``, so that list positions match playlist positions.
+        """
+        track_ids = []
+        offset = 0
+        limit = 100
+        while True:
+            response = self.client.playlist_items(
+                self.playlist_id,
+                offset=offset,
+                limit=limit,
+                fields="items.track.id,next",
+            )
+            items = response["items"]
+            if not items:
+                break
+            track_ids.extend((item.get("track") or {}).get("id") for item in items)
+            if response["next"] is None:
+                break
+            offset += limit
+        return track_ids
+
     def __getitem__(self, key: TrackKeySpec) -> TrackMetadata | list[TrackMetadata]:
         return self.tracks[key]
 
@@ -477,10 +661,44 @@ class PlaylistReader(Tracks, Mapping[TrackId, TrackMetadata]):
 
 
 class Playlist(PlaylistReader, MutableMapping[TrackId, TrackMetadata]):
-    """A Spotify playlist with mutable mapping interface."""
+    """A Spotify playlist with mutable mapping interface.
+
+    By default, any change made through the playlist drops its loaded tracks, so the
+    next read fetches them all again. With ``write_through=True``, changes are
+    applied to the loaded tracks instead (the metadata of added tracks being fetched
+    in one batched pass), and tracks are only fetched again when the playlist's
+    ``snapshot_id`` shows it was changed by someone else.
+
+    ``add_songs(..., skip_existing=True)`` only adds tracks that aren't in the playlist
+    yet. It checks a membership index of the playlist's track ids, fetched (ids only)
+    the first time it's needed, and then kept current by the playlist's own writes.
+    In write-through mode, the index is also fetched again if someone else changed the
+    playlist (but otherwise, edits made elsewhere go unnoticed).
+    """
 
-    def __init__(self, playlist_id: str, *, client: Any | None = None):
-        super().__init__(playlist_id=playlist_id, client=client)
+    def __init__(
+        self,
+        playlist_id: str,
+        *,
+        client: Any | None = None,
+        track_store: TrackStore | None = None,
+        write_through: bool = False,
+    ):
+        super().__init__(
+            playlist_id=playlist_id, client=client, track_store=track_store
+        )
+        self.write_through = write_through
+        self._snapshot_id: str | None = None  # snapshot the loaded tracks reflect
+        self._members: Counter | None = None  # track id counts (membership index)
+        self._members_snapshot: str | None = None  # snapshot the index reflects
+
+    @property
+    def tracks(self) -> Tracks:
+        if self.write_through and self._tracks is None:
+            # Read the snapshot first: if the playlist changes while we read tracks,
+            # the next write will see a different snapshot, and resync.
+            _, self._snapshot_id = playlist_state(self.client, self.playlist_id)
+        return super().tracks
 
     def __setitem__(self, key: TrackId, value: Any) -> None:
         raise NotImplementedError(
@@ -492,35 +710,338 @@ class Playlist(PlaylistReader, MutableMapping[TrackId, TrackMetadata]):
         if key not in self:
             raise KeyError(key)
         self.delete_songs([key])
-        self._invalidate_cache()
 
-    def add_songs(self, track_list: TrackId | Iterable[TrackId]) -> None:
+    def add_songs(
+        self,
+        track_list: TrackId | Iterable[TrackId],
+        *,
+        position: int | None = None,
+        on_progress: ProgressCallback | None = None,
+        checkpoint_path: str | None = None,
+        skip_existing: bool = False,
+    ) -> None:
+        """
+        Add tracks to the playlist, in order, in batches of 100.
+
+        Failed batches are retried without risking duplicates, ``on_progress`` is
+        called with ``(n_added, n_tracks)`` after each batch, and, given a
+        ``checkpoint_path``, a run that died partway is resumed by running it again.
+        See `sung.playlist_ops.bulk_add_items`.
+
+        With ``skip_existing=True``, tracks already in the playlist (or repeated in
+        ``track_list``) are skipped. Only the first such call reads the playlist's
+        track ids: after that, the membership index is maintained by writes, and
+        is read again only if the playlist's snapshot shows someone else edited it.
+        """
         if isinstance(track_list, str):
             track_list = [track_list]
         else:
             track_list = list(track_list)
-        for i in range(0, len(track_list), 100):
-            self.client.playlist_add_items(self.playlist_id, track_list[i : i + 100])
-        self._invalidate_cache()
+        total, snapshot_id = self._server_state()
+        if skip_existing:
+            if snapshot_id is None:
+                # Check membership against the playlist as it is now, not as it was
+                # when the index was built (someone else may have edited it since)
+                total, snapshot_id = playlist_state(self.client, self.playlist_id)
+                if snapshot_id != self._members_snapshot:
+                    self._members = None
+            members = self._membership(snapshot_id)
+            new_ids = {}
+            for track in track_list:
+                track_id = ensure_track_id(track)
+                if track_id not in members and track_id not in new_ids:
+                    new_ids[track_id] = track
+            track_list = list(new_ids.values())
+            if not track_list:
+                return
+        snapshot_id = bulk_add_items(
+            self.client,
+            self.playlist_id,
+            track_list,
+            position=position,
+            on_progress=on_progress,
+            checkpoint_path=checkpoint_path,
+            playlist_total=total,
+            snapshot_id=snapshot_id,
+        )
+        new_track_ids = None
+        if self._tracks is not None:
+            new_track_ids = list(self._tracks.track_ids)
+            position = len(new_track_ids) if position is None else position
+            new_track_ids[position:position] = map(ensure_track_id, track_list)
+        self._write_through(new_track_ids, snapshot_id)
+        self._update_members(snapshot_id, added=map(ensure_track_id, track_list))
 
     def delete_songs(self, track_list: TrackId | Iterable[TrackId]) -> None:
         if isinstance(track_list, str):
             track_list = [track_list]
         else:
             track_list = list(track_list)
-        self.client.playlist_remove_all_occurrences_of_items(
-            self.playlist_id, track_list
+        _, snapshot_id = self._server_state()
+        response = self.client.playlist_remove_all_occurrences_of_items(
+            self.playlist_id, track_list, snapshot_id=snapshot_id
+        )
+        snapshot_id = (response or {}).get("snapshot_id")
+        deleted = set(map(ensure_track_id, track_list))
+        new_track_ids = None
+        if self._tracks is not None:
+            new_track_ids = [t for t in self._tracks.track_ids if t not in deleted]
+        self._write_through(new_track_ids, snapshot_id)
+        self._update_members(snapshot_id, deleted=deleted)
+
+    def remove_positions(
+        self, positions: Iterable[int], *, snapshot_id: str | None = None
+    ) -> str:
+        """
+        Remove the items at the given positions (and only those occurrences).
+
+        Positions refer to the playlist as of ``snapshot_id`` (the current snapshot
+        if not given); the API refuses the removal if they don't match it.
+        The items at those positions are read from the playlist as it is now, so a
+        ``snapshot_id`` that isn't the current one is refused (``ValueError``), as
+        are positions out of range.
+        Returns the new ``snapshot_id``.
+        """
+        positions = sorted(set(positions))
+        if snapshot_id is None:
+            snapshot_id = self._current_snapshot()
+            track_ids = self._fetch_track_ids()
+        else:
+            track_ids = self._fetch_track_ids()
+            # (read after the ids: if it's still the given one, so were the ids)
+            _, current_snapshot_id = playlist_state(self.client, self.playlist_id)
+            if current_snapshot_id != snapshot_id:
+                raise ValueError(
+                    f"Playlist {self.playlist_id} changed since snapshot "
+                    f"{snapshot_id!r} (it's now {current_snapshot_id!r}): "
+                    "its items at the given positions can't be known."
+                )
+        if positions and not (0 <= positions[0] and positions[-1] < len(track_ids)):
+            raise ValueError(
+                f"Positions must be between 0 and {len(track_ids) - 1} (the playlist "
+                f"has {len(track_ids)} items): {positions}"
+            )
+        if without_id := [p for p in positions if track_ids[p] is None]:
+            raise ValueError(
+                f"The items at positions {without_id} have no track id (e.g. local "
+                "files), so they can't be removed by position."
+            )
+        op = RemoveOp(tuple((track_ids[position], position) for position in positions))
+        snapshot_id = send_ops(
+            self.client, self.playlist_id, [op], snapshot_id=snapshot_id
+        )
+        self._write_through(apply_op(track_ids, op), snapshot_id)
+        self._update_members(snapshot_id, removed=(item for item, _ in op.items))
+        return snapshot_id
+
+    def reorder(
+        self,
+        new_order: Sequence[int] | Sequence[TrackRef],
+        *,
+        snapshot_id: str | None = None,
+    ) -> list:
+        """
+        Reorder the playlist with few range moves.
+
+        ``new_order`` is either a permutation of the playlist's positions (the
+        position of the item to put first, then second, etc.), or the playlist's
+        track ids, in their new order.
+
+        Items already in a good relative order stay in place, and runs of items
+        that stay together move in one request (see `sung.playlist_ops.plan_moves`),
+        so the number of requests is about the number of runs moved.
+        Returns the list of moves that were made.
+
+        A permutation that doesn't have as many positions as the playlist (as of
+        ``snapshot_id``, if it's the current one) has items is refused
+        (``ValueError``).
+        """
+        new_order = list(new_order)
+        if new_order and isinstance(new_order[0], str):
+            if snapshot_id is None:
+                snapshot_id = self._current_snapshot()
+            current = self._fetch_track_ids()
+            target = [ensure_track_id(t) for t in new_order]
+            if sorted(current, key=str) != sorted(target, key=str):
+                raise ValueError("new_order must hold the same tracks as the playlist")
+            ops = plan_sync(current, target)
+        else:
+            if sorted(new_order) != list(range(len(new_order))):
+                raise ValueError("new_order must be a permutation of positions")
+            total, current_snapshot_id = self._current_state()
+            if snapshot_id is None:
+                snapshot_id = current_snapshot_id
+            if snapshot_id == current_snapshot_id and len(new_order) != total:
+                raise ValueError(
+                    f"new_order has {len(new_order)} positions, but the playlist has "
+                    f"{total} items"
+                )
+            target_position = {p: i for i, p in enumerate(new_order)}
+            ops = plan_moves([target_position[p] for p in range(len(new_order))])
+            target = None
+            if self._tracks is not None and len(self._tracks) == len(new_order):
+                target = [self._tracks.track_ids[p] for p in new_order]
+        snapshot_id = send_ops(
+            self.client, self.playlist_id, ops, snapshot_id=snapshot_id
         )
-        self._invalidate_cache()
+        self._write_through(target, snapshot_id)
+        self._update_members(snapshot_id)
+        return ops
+
+    def sync_to(self, target_track_ids: Iterable[TrackRef]) -> list:
+        """
+        Make the playlist hold exactly ``target_track_ids``, in that order, with few
+        API calls.
+
+        Rather than emptying and refilling the playlist, this removes, moves and
+        inserts only what it must (see `sung.playlist_ops.plan_sync`), in batches.
+        Tracks that stay keep their ``added_at`` date.
 
-    def extend(self, track_list: Iterable[TrackId]) -> None:
-        self.add_songs(track_list)
+        Returns the list of (unbatched) ops that were applied.
+        """
+        target = [ensure_track_id(t) for t in target_track_ids]
+        snapshot_id = self._current_snapshot()
+        current = self._fetch_track_ids()
+        if None in current:
+            raise ValueError(
+                f"Playlist {self.playlist_id} has items without a track id "
+                "(e.g. local files), which can't be synced."
+            )
+        ops = plan_sync(current, target)
+        snapshot_id = send_ops(
+            self.client, self.playlist_id, ops, snapshot_id=snapshot_id
+        )
+        self._write_through(target, snapshot_id)
+        self._update_members(snapshot_id, now=target)
+        return ops
+
+    def extend(
+        self, track_list: Iterable[TrackId], *, skip_existing: bool = False
+    ) -> None:
+        self.add_songs(track_list, skip_existing=skip_existing)
 
     def append(self, track_id: TrackId) -> None:
         self.extend([track_id])
 
     def _invalidate_cache(self) -> None:
         self._tracks = None  # Invalidate the cached Tracks instance
+        self._snapshot_id = None
+
+    def _server_state(self) -> tuple[int | None, str | None]:
+        """The playlist's ``(total, snapshot_id)``, before a write.
+
+        In write-through mode, it's read from the server (one light request), and if
+        the snapshot isn't the one the loaded tracks reflect, someone else changed
+        the playlist, so the loaded tracks are dropped. Otherwise, ``(None, None)``,
+        letting writes get the state themselves if they need it.
+        """
+        if not self.write_through:
+            return None, None
+        total, snapshot_id = playlist_state(self.client, self.playlist_id)
+        if snapshot_id != self._snapshot_id:
+            self._invalidate_cache()
+        if snapshot_id != self._members_snapshot:
+            self._members = None
+        return total, snapshot_id
+
+    def _current_state(self) -> tuple[int, str]:
+        """The playlist's current ``(total, snapshot_id)``, for writes that must be
+        guarded by it (whatever the mode). In write-through mode, it's also checked
+        against the loaded tracks (see `_server_state`)."""
+        total, snapshot_id = self._server_state()
+        if snapshot_id is None:
+            total, snapshot_id = playlist_state(self.client, self.playlist_id)
+        return total, snapshot_id
+
+    def _current_snapshot(self) -> str:
+        """The playlist's current ``snapshot_id`` (see `_current_state`)."""
+        return self._current_state()[1]
+
+    def _membership(self, snapshot_id: str | None = None) -> Counter:
+        """The membership index: how many times each track id is in the playlist.
+
+        It's taken from the loaded tracks if any, or else from a fetch of the
+        playlist's track ids (only), and is then updated by writes (see
+        `_update_members`), so that checking membership costs no more reads.
+
+        It's an exact index (a ``Counter`` of ids) rather than, say, a Bloom filter:
+        a false positive would silently skip a track that should have been added,
+        and the ids of even a 10,000 tracks playlist take well under a megabyte.
+
+        Given the playlist's current ``snapshot_id``, loaded tracks of another
+        snapshot aren't used, and the index is recorded as being of that snapshot.
+        """
+        if self._members is None:
+            if self._tracks is not None and snapshot_id in (None, self._snapshot_id):
+                track_ids, snapshot_id = self._tracks.track_ids, self._snapshot_id
+            else:
+                if snapshot_id is None and self.write_through:
+                    _, snapshot_id = playlist_state(self.client, self.playlist_id)
+                track_ids = self._fetch_track_ids()
+            self._members = Counter(t for t in track_ids if t is not None)
+            self._members_snapshot = snapshot_id
+        return self._members
+
+    def _update_members(
+        self,
+        snapshot_id: str | None,
+        *,
+        added: Iterable[TrackId] = (),
+        removed: Iterable[TrackId] = (),
+        deleted: Iterable[TrackId] = (),
+        now: Iterable[TrackId] | None = None,
+    ) -> None:
+        """Update the membership index (if any) after a write that ``added`` tracks,
+        ``removed`` occurrences of tracks, ``deleted`` all occurrences of tracks, or
+        left the playlist with the tracks ``now``, resulting in ``snapshot_id``."""
+        if self._members is None:
+            return
+        if self.write_through and snapshot_id is None:
+            self._members = None  # can't tell later whether it's current
+            return
+        if now is not None:
+            self._members = Counter(now)
+        else:
+            self._members.update(added)
+            self._members.subtract(removed)
+            for track_id in deleted:
+                self._members.pop(track_id, None)
+            self._members = +self._members  # drop ids with no occurrences left
+        self._members.pop(None, None)
+        self._members_snapshot = snapshot_id
+
+    def _write_through(
+        self, track_ids: Sequence[TrackId | None] | None, snapshot_id: str | None
+    ) -> None:
+        """Make the loaded tracks be ``track_ids``, after a write that resulted in
+        ``snapshot_id``, fetching the metadata of new tracks in one batched pass.
+
+        If not in write-through mode, no tracks are loaded, or ``track_ids`` or
+        ``snapshot_id`` are unknown (None), the loaded tracks are just dropped.
+        """
+        if (
+            not self.write_through
+            or self._tracks is None
+            or track_ids is None
+            or snapshot_id is None
+        ):
+            self._invalidate_cache()
+            return
+        track_ids = [t for t in track_ids if t is not None]
+        known = {meta["id"]: meta for meta in self._tracks.track_metas}
+        store = self.track_store if self.track_store is not None else {}
+        missing = [t for t in dict.fromkeys(track_ids) if t not in known]
+        to_fetch = [t for t in missing if t not in store]
+        fetched = [m for m in track_ids_to_metas(to_fetch, self.client) if m]
+        if fetched:
+            _notify_track_metas_observers(fetched)
+        if self.track_store is not None:
+            fetched = self.track_store.intern_many(fetched)
+        known.update((meta["id"], meta) for meta in fetched)
+        known.update((t, store[t]) for t in missing if t in store)
+        track_metas = [known[t] for t in track_ids if t in known]
+        self._tracks = Tracks(tracks=track_metas, client=self.client)
+        self._snapshot_id = snapshot_id
 
     @classmethod
     def create_from_track_list(
@@ -531,6 +1052,7 @@ class Playlist(PlaylistReader, MutableMapping[TrackId, TrackMetadata]):
         *,
         client: Any | None = None,
         user_id=None,
+        on_progress: ProgressCallback | None = None,
     ) -> "Playlist":
         """
         Create a new playlist from a list of track IDs.
@@ -541,34 +1063,166 @@ class Playlist(PlaylistReader, MutableMapping[TrackId, TrackMetadata]):
             - public: Whether the playlist should be public.
             - client: The Spotify client to use for creating the playlist.
             - user_id: The user ID of the playlist owner.
+            - on_progress: Called with ``(n_added, n_tracks)`` after each batch.
         """
-        track_list = [cast_track_key(track, "uri") for track in track_list]
-
         # self.client = get_spotify_client(client, ensure_scope="playlist-modify-private playlist-modify-public")
 
         if client is None:
-            scope = "playlist-modify-public playlist-modify-private"
-            client = get_spotify_client(ensure_scope=scope)
+            client = pooled_client(ensure_scope=PLAYLIST_MODIFY_SCOPE)
 
         if user_id is None:
             user_id = client.me()["id"]
 
-        # Create a new playlist
-        playlist = client.user_playlist_create(
-            user=user_id, name=playlist_name, public=public
+        playlist_id = _create_playlist(
+            client, user_id, playlist_name, track_list, public, on_progress
         )
-        playlist_id = playlist["id"]
+        return cls(playlist_id, client=client)
 
-        # Add tracks to the playlist in batches of 100
-        for i in range(0, len(track_list), 100):
-            client.playlist_add_items(playlist_id, track_list[i : i + 100])
+    @classmethod
+    def create_many(
+        cls,
+        track_lists: Mapping[str, Sequence[TrackId]],
+        public: bool = True,
+        *,
+        client: Any | None = None,
+        user_id=None,
+        max_workers: int = DFLT_MAX_WORKERS,
+        on_progress: Callable[[str, int, int], None] | None = None,
+    ) -> "CreatedPlaylists":
+        """
+        Create many playlists, concurrently, from a ``{playlist_name: track_list}``
+        mapping.
 
-        return cls(playlist_id, client=client)
+        The user is looked up once, and all playlists are created (and filled)
+        through one client: by default, the pooled client of `sung.clients`, whose
+        requests all go through the shared rate limiting scheduler of
+        `sung.throttle`, so that concurrent creations don't cascade into 429s.
+
+        Parameters:
+            - track_lists: The track lists (of ids, uris or urls), keyed by the names
+              of the playlists to create for them.
+            - public: Whether the playlists should be public.
+            - client: The Spotify client to use (it should be thread-safe).
+            - user_id: The user ID of the playlists' owner.
+            - max_workers: How many playlists to create at the same time.
+            - on_progress: Called with ``(playlist_name, n_added, n_tracks)`` after
+              each batch of tracks added.
+
+        Returns:
+            A ``(playlists, errors)`` named tuple: the created playlists and the
+            exceptions of the failed creations, each keyed by playlist name.
+            A playlist can be created but fail to be filled: it's then in ``errors``,
+            with the exception's ``playlist_id`` attribute set to its id.
+        """
+        if client is None:
+            client = pooled_client(ensure_scope=PLAYLIST_MODIFY_SCOPE)
+        if user_id is None:
+            user_id = client.me()["id"]
+
+        def create(name, track_list):
+            progress = None
+            if on_progress is not None:
+                progress = lambda n_added, n_tracks: on_progress(
+                    name, n_added, n_tracks
+                )
+            playlist_id = _create_playlist(
+                client, user_id, name, track_list, public, progress
+            )
+            return cls(playlist_id, client=client)
+
+        playlists, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                name: executor.submit(create, name, track_list)
+                for name, track_list in track_lists.items()
+            }
+            for name, future in futures.items():
+                try:
+                    playlists[name] = future.result()
+                except Exception as error:
+                    errors[name] = error
+        return CreatedPlaylists(playlists, errors)
+
+
+class CreatedPlaylists(NamedTuple):
+    """The result of `Playlist.create_many`."""
+
+    playlists: dict[str, Playlist]
+    errors: dict[str, Exception]
+
+
+def _create_playlist(
+    client,
+    user_id: str,
+    playlist_name: str,
+    track_list: Iterable[TrackId],
+    public: bool = True,
+    on_progress: ProgressCallback | None = None,
+) -> str:
+    """Create a playlist holding the tracks of ``track_list``. Returns its id."""
+    track_list = [cast_track_key(track, "uri") for track in track_list]
+
+    # Create a new playlist
+    playlist = client.user_playlist_create(
+        user=user_id, name=playlist_name, public=public
+    )
+    playlist_id = playlist["id"]
+
+    # Add tracks to the (empty) playlist in batches of 100
+    try:
+        bulk_add_items(
+            client,
+            playlist_id,
+            track_list,
+            playlist_total=0,
+            snapshot_id=playlist.get("snapshot_id"),
+            on_progress=on_progress,
+        )
+    except Exception as error:
+        error.playlist_id = playlist_id  # so callers can find (or delete) it
+        raise
+    return playlist_id
+
+
+def load_playlists(
+    playlists: Iterable[str],
+    *,
+    client: Any | None = None,
+    track_store: TrackStore | None = None,
+    max_workers: int = DFLT_MAX_WORKERS,
+    reader_factory: Callable[..., PlaylistReader] = PlaylistReader,
+) -> dict[str, PlaylistReader]:
+    """
+    Load many playlists concurrently, sharing one client and one track store.
+
+    Parameters:
+        - playlists: Playlist ids, uris or urls. Duplicates are only fetched once.
+        - client: The Spotify client all fetches go through.
+        - track_store: The `TrackStore` to deduplicate tracks into (a new one by default).
+        - max_workers: How many playlists to fetch at the same time.
+        - reader_factory: What to make readers with (e.g. `Playlist` for mutable ones).
+
+    Returns:
+        A ``{playlist_id: reader}`` dict, in the order the playlists were given,
+        whose readers' tracks are already fetched and backed by `track_store`.
+    """
+    client = ensure_client(client)
+    if track_store is None:
+        track_store = TrackStore()
+    playlist_ids = list(dict.fromkeys(map(ensure_playlist_id, playlists)))
+    readers = {
+        playlist_id: reader_factory(playlist_id, client=client, track_store=track_store)
+        for playlist_id in playlist_ids
+    }
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Accessing .tracks triggers (and caches) each reader's fetch
+        list(executor.map(lambda reader: reader.tracks, readers.values()))
+    return readers
 
 
 def delete_playlist(playlist_id, verbose=DFLT_VERBOSE, *, ask_confirmation=True):
     # Authenticate with appropriate scope
-    client = get_spotify_client(scope="playlist-modify-public playlist-modify-private")
+    client = pooled_client(scope=PLAYLIST_MODIFY_SCOPE)
 
     if ask_confirmation:
         response = input(
@@ -590,10 +1244,10 @@ def delete_playlist(playlist_id, verbose=DFLT_VERBOSE, *, ask_confirmation=True)
 
 class SpotifyDacc:
     def __init__(self, client=None):
-        self.client = get_spotify_client(client)
+        self.client = ensure_client(client)
 
     def recently_played(self, *, extract="items.*.track.name", limit=50, **kwargs):
-        client = get_spotify_client(
+        client = client_registry.for_client(
             self.client, ensure_scope="user-read-recently-played"
         )
         results = client.current_user_recently_played(limit=limit)
@@ -610,7 +1264,7 @@ class SpotifyDacc:
 
         To get names of artists, use extract='items.*.artists.*.name'
         """
-        client = get_spotify_client(self.client, ensure_scope="user-top-read")
+        client = client_registry.for_client(self.client, ensure_scope="user-top-read")
         results = client.current_user_top_tracks(
             limit=limit, time_range=time_range, **kwargs
         )
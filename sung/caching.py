@@ -0,0 +1,354 @@
+"""Two-tier (memory and disk) caches, for Spotify search results and song resolutions.
+
+Song resolution runs the same searches again and again, across runs and across
+workers. `SearchCache` keeps search responses in an in-memory LRU, backed by a
+directory of JSON files that other processes (and later runs) can read, both
+expiring after a ``ttl``.
+
+Keys are normalized, so that searches that are bound to get the same response share
+an entry: the final query string (after adding ``year:`` and ``genre:`` qualifiers),
+with whitespace collapsed and case folded, the (sorted) search types, the market,
+the limit and the offset.
+
+Use a cache for a call with ``search_tracks(..., cache=my_cache)``, or for all calls
+with ``enable_search_cache()``.
+
+`ResolutionMemo` is the same kind of cache, for the `sung.playlists.SongMatch` song
+descriptors resolve to (see `sung.playlists.resolve_song`).
+
+>>> cache = SearchCache(rootdir=None)  # memory only
+>>> key = cache.key('Love  Me year:1999', 'track', None, 10, 0)
+>>> key
+('love me year:1999', 'track', None, 10, 0)
+>>> cache.get(key) is None
+True
+>>> cache.set(key, {'tracks': {'items': []}})
+>>> cache.get(key)
+{'tracks': {'items': []}}
+>>> cache.stats()['hits'], cache.stats()['misses']
+(1, 1)
+
+"""
+
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from hashlib import sha256
+
+SEARCH_CACHE_DIR_ENV_VAR = "SUNG_SEARCH_CACHE_DIR"
+DFLT_SEARCH_CACHE_TTL = 7 * 24 * 3600  # seconds
+DFLT_SEARCH_CACHE_MAXSIZE = 4096  # entries kept in memory
+RESOLUTION_MEMO_DIR_ENV_VAR = "SUNG_RESOLUTION_MEMO_DIR"
+DFLT_RESOLUTION_MEMO_TTL = 30 * 24 * 3600  # seconds
+
+
+def _default_rootdir(env_var: str, dirname: str) -> str:
+    return os.environ.get(env_var) or os.path.join(
+        os.path.expanduser("~"), ".cache", "sung", dirname
+    )
+
+
+class TwoTierCache:
+    """An in-memory LRU of JSON-serializable values, backed by JSON files, with a TTL.
+
+    Keys are tuples (of JSON-serializable values). Values are kept as JSON (in
+    memory too), so `get` hands out a new copy each time: callers may modify it.
+
+    The files are named ``<file_prefix><sha256 of the key>.json``, so that `clear`
+    only removes those of this kind of cache, even in a directory shared with others.
+
+    Parameters:
+        - maxsize: How many values to keep in memory.
+        - ttl: How many seconds a value stays valid (None for forever).
+        - rootdir: The directory to keep values in (by default, ``default_rootdir()``,
+          which is None, for a memory-only cache, unless overridden).
+    """
+
+    file_prefix = "cache-"
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = DFLT_SEARCH_CACHE_MAXSIZE,
+        ttl: float | None = DFLT_SEARCH_CACHE_TTL,
+        rootdir: str | None = ...,
+        clock=time.time,
+    ):
+        if rootdir is ...:
+            rootdir = self.default_rootdir()
+        if rootdir is not None:
+            os.makedirs(rootdir, exist_ok=True)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.rootdir = rootdir
+        self.clock = clock
+        self._memory: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(
+            ["memory_hits", "disk_hits", "misses", "expired"], 0
+        )
+
+    @staticmethod
+    def default_rootdir() -> str | None:
+        return None
+
+    def _path(self, key: tuple) -> str:
+        digest = sha256(json.dumps(key).encode()).hexdigest()
+        return os.path.join(self.rootdir, f"{self.file_prefix}{digest}.json")
+
+    def _is_cache_file(self, filename: str) -> bool:
+        digest = filename[len(self.file_prefix) : -len(".json")]
+        return (
+            filename.startswith(self.file_prefix)
+            and filename.endswith(".json")
+            and len(digest) == 64
+            and all(c in "0123456789abcdef" for c in digest)
+        )
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return self.ttl is None or self.clock() - stored_at < self.ttl
+
+    def _remember(self, key: tuple, stored_at: float, results_json: str) -> None:
+        self._memory[key] = (stored_at, results_json)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, key: tuple):
+        """The cached value for ``key``, or None if there's no fresh one."""
+        expired = False
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._is_fresh(entry[0]):
+                    self._memory.move_to_end(key)
+                    self._counts["memory_hits"] += 1
+                    results_json = entry[1]
+                else:
+                    del self._memory[key]
+                    expired = True
+        if entry is not None and not expired:
+            return json.loads(results_json)  # (parsed outside the lock)
+        if self.rootdir is not None:
+            try:
+                with open(self._path(key)) as fp:
+                    stored = json.load(fp)
+            except (OSError, ValueError):
+                stored = None
+            if stored is not None and stored.get("key") == list(key):
+                with self._lock:
+                    if self._is_fresh(stored["stored_at"]):
+                        results_json = json.dumps(stored["results"])
+                        self._remember(key, stored["stored_at"], results_json)
+                        self._counts["disk_hits"] += 1
+                        return stored["results"]
+                    expired = True
+        with self._lock:
+            self._counts["misses"] += 1
+            self._counts["expired"] += expired
+        return None
+
+    def set(self, key: tuple, results) -> None:
+        """Cache the value ``results`` for ``key``."""
+        stored_at = self.clock()
+        results_json = json.dumps(results)
+        with self._lock:
+            self._remember(key, stored_at, results_json)
+        if self.rootdir is not None:
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as fp:
+                json.dump(
+                    {"key": list(key), "stored_at": stored_at, "results": results}, fp
+                )
+            os.replace(tmp_path, path)
+
+    def invalidate(self, key: tuple) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.rootdir is not None:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """Forget all cached values (in memory, and on disk: only this cache's files
+        are removed from ``rootdir``)."""
+        with self._lock:
+            self._memory.clear()
+        if self.rootdir is not None:
+            for filename in os.listdir(self.rootdir):
+                if self._is_cache_file(filename):
+                    try:
+                        os.remove(os.path.join(self.rootdir, filename))
+                    except FileNotFoundError:
+                        pass  # (removed by another process meanwhile)
+
+    def stats(self) -> dict[str, int]:
+        """Hit and miss counts (``hits`` being memory plus disk hits)."""
+        with self._lock:
+            counts = dict(self._counts)
+            counts["hits"] = counts["memory_hits"] + counts["disk_hits"]
+            counts["in_memory"] = len(self._memory)
+            return counts
+
+
+def _normalize_text(text: str | None) -> str | None:
+    return " ".join(text.split()).casefold() if text is not None else None
+
+
+class SearchCache(TwoTierCache):
+    """A `TwoTierCache` of search responses.
+
+    Its files are in the directory named by the ``SUNG_SEARCH_CACHE_DIR`` environment
+    variable, or ``~/.cache/sung/search``, by default.
+    """
+
+    file_prefix = "search-"
+
+    @staticmethod
+    def default_rootdir() -> str:
+        return _default_rootdir(SEARCH_CACHE_DIR_ENV_VAR, "search")
+
+    @staticmethod
+    def key(
+        query_string: str, search_type: str, market=None, limit=None, offset=0
+    ) -> tuple:
+        """The normalized key of a search."""
+        search_type = ",".join(sorted(t.strip() for t in search_type.split(",")))
+        return (_normalize_text(query_string), search_type, market, limit, offset)
+
+
+class ResolutionMemo(TwoTierCache):
+    """A `TwoTierCache` of song resolutions (`sung.playlists.SongMatch` dicts).
+
+    Its files are in the directory named by the ``SUNG_RESOLUTION_MEMO_DIR``
+    environment variable, or ``~/.cache/sung/resolutions``, by default, and they
+    stay valid for 30 days (only songs that were found are kept).
+
+    >>> memo = ResolutionMemo(rootdir=None)
+    >>> memo.key(' Fix  You', 'Coldplay', None, 10)
+    ('fix you', 'coldplay', None, 10, None, None)
+    """
+
+    file_prefix = "resolution-"
+
+    def __init__(self, *, ttl: float | None = DFLT_RESOLUTION_MEMO_TTL, **kwargs):
+        super().__init__(ttl=ttl, **kwargs)
+
+    @staticmethod
+    def default_rootdir() -> str:
+        return _default_rootdir(RESOLUTION_MEMO_DIR_ENV_VAR, "resolutions")
+
+    @staticmethod
+    def key(
+        name: str,
+        artist: str | None,
+        market=None,
+        search_limit=None,
+        ambiguous_score_gap=None,
+        initial_limit=None,
+    ) -> tuple:
+        """The normalized key of a song resolution (``initial_limit`` being that of
+        adaptive resolutions, None for others: an adaptive resolution may have
+        fewer candidates than a full one, so they're kept apart)."""
+        name, artist = _normalize_text(name), _normalize_text(artist)
+        return (name, artist, market, search_limit, ambiguous_score_gap, initial_limit)
+
+
+# The cache searches use when not told otherwise (None: no caching)
+search_cache: SearchCache | None = None
+# The cache searches use when told to use "the default" one (cache=True), while
+# caching isn't enabled for all searches (made when first needed)
+_default_search_cache: SearchCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def enable_search_cache(cache: SearchCache | None = None, **kwargs) -> SearchCache:
+    """Make searches use ``cache`` (or a new `SearchCache` made with ``kwargs``) by
+    default. Returns the cache."""
+    global search_cache
+    search_cache = cache if cache is not None else SearchCache(**kwargs)
+    return search_cache
+
+
+def disable_search_cache() -> None:
+    """Make searches not use a cache by default."""
+    global search_cache
+    search_cache = None
+
+
+def default_search_cache() -> SearchCache:
+    """The cache of searches made with ``cache=True``: the enabled one, if any, or
+    else a `SearchCache` of this module (that doesn't enable caching for other
+    searches)."""
+    global _default_search_cache
+    if search_cache is not None:
+        return search_cache
+    with _default_cache_lock:
+        if _default_search_cache is None:
+            _default_search_cache = SearchCache()
+        return _default_search_cache
+
+
+def resolve_search_cache(cache: SearchCache | bool | None) -> SearchCache | None:
+    """The cache a search should use, given its ``cache`` argument: a `SearchCache`,
+    True (the default one, see `default_search_cache`, for this search only), False
+    (none), or None (the enabled one, if any)."""
+    if cache is None:
+        return search_cache
+    if cache is True:
+        return default_search_cache()
+    if cache is False:
+        return None
+    return cache
+
+
+# The memo song resolutions use when not told otherwise (None: no memo)
+resolution_memo: ResolutionMemo | None = None
+# The memo of resolutions made with memo=True, while no memo is enabled
+_default_resolution_memo: ResolutionMemo | None = None
+
+
+def enable_resolution_memo(
+    memo: ResolutionMemo | None = None, **kwargs
+) -> ResolutionMemo:
+    """Make song resolutions use ``memo`` (or a new `ResolutionMemo` made with
+    ``kwargs``) by default. Returns the memo."""
+    global resolution_memo
+    resolution_memo = memo if memo is not None else ResolutionMemo(**kwargs)
+    return resolution_memo
+
+
+def disable_resolution_memo() -> None:
+    """Make song resolutions not use a memo by default."""
+    global resolution_memo
+    resolution_memo = None
+
+
+def default_resolution_memo() -> ResolutionMemo:
+    """The memo of resolutions made with ``memo=True`` (see `default_search_cache`)."""
+    global _default_resolution_memo
+    if resolution_memo is not None:
+        return resolution_memo
+    with _default_cache_lock:
+        if _default_resolution_memo is None:
+            _default_resolution_memo = ResolutionMemo()
+        return _default_resolution_memo
+
+
+def resolve_resolution_memo(
+    memo: ResolutionMemo | bool | None,
+) -> ResolutionMemo | None:
+    """The memo a resolution should use, given its ``memo`` argument (see
+    `resolve_search_cache`)."""
+    if memo is None:
+        return resolution_memo
+    if memo is True:
+        return default_resolution_memo()
+    if memo is False:
+        return None
+    return memo
@@ -22,30 +22,192 @@ Combine both features:
 
 """
 
+import os
+import json
 from functools import lru_cache
+from typing import Optional
+from collections.abc import Iterable
+
+from sung.caching import _default_rootdir
+
+LYRICS_AND_CHORDS_KAGGLE_DATASET = "eitanbentora/chords-and-lyrics-dataset"
+LYRICS_AND_CHORDS_CSV = "chords_and_lyrics.csv"
+DATASET_CACHE_DIR_ENV_VAR = "SUNG_DATASET_CACHE_DIR"
+# Bump when the way the columnar copy is made changes (so that old copies are remade)
+DATASET_CACHE_VERSION = 1
+
+
+def _download_lyrics_and_chords_csv() -> bytes:
+    from haggle import get_kaggle_dataset
+
+    data = get_kaggle_dataset(LYRICS_AND_CHORDS_KAGGLE_DATASET)
+    return data[LYRICS_AND_CHORDS_CSV]
 
 
 @lru_cache(maxsize=1)
-def get_lyrics_and_chords_dataset():
+def _lyrics_and_chords_csv_dataframe():
     import pandas as pd
     import io
-    from haggle import get_kaggle_dataset
 
-    data = get_kaggle_dataset("eitanbentora/chords-and-lyrics-dataset")
+    return pd.read_csv(io.BytesIO(_download_lyrics_and_chords_csv()))
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow.feather  # pip install pyarrow  # noqa
+    except ImportError:
+        return False
+    return True
+
+
+def _dataset_cache_paths(cache_dir: str) -> tuple[str, str]:
+    """The paths of the (Feather) columnar copy of the dataset, and of its marker."""
+    stem = os.path.join(cache_dir, os.path.splitext(LYRICS_AND_CHORDS_CSV)[0])
+    return f"{stem}.feather", f"{stem}.json"
 
-    return pd.read_csv(io.BytesIO(data["chords_and_lyrics.csv"]))
+
+def _is_valid_dataset_cache(cache_dir: str) -> bool:
+    """Whether the columnar copy is there, and is the one the marker was written for
+    (by this version).
+
+    Only the file's size and modification time are checked, not its contents (a
+    checksum would mean reading the whole file in each process, when it's otherwise
+    memory mapped and only read as needed). That's enough to tell a copy that was
+    truncated, or rewritten without its marker, but not one edited in place while
+    keeping both.
+    """
+    path, marker_path = _dataset_cache_paths(cache_dir)
+    try:
+        with open(marker_path) as fp:
+            marker = json.load(fp)
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return False
+    return (
+        marker.get("version") == DATASET_CACHE_VERSION
+        and marker.get("source") == LYRICS_AND_CHORDS_KAGGLE_DATASET
+        and marker.get("n_bytes") == stat.st_size
+        and marker.get("mtime_ns") == stat.st_mtime_ns
+    )
+
+
+def _make_dataset_cache(cache_dir: str) -> None:
+    """Download the dataset, and write it as an (uncompressed, so memory mappable)
+    Feather file, with a JSON marker of its version, size and modification time."""
+    import io
+    import pandas as pd
+    import pyarrow.feather as feather
+
+    csv_bytes = _download_lyrics_and_chords_csv()
+    df = pd.read_csv(io.BytesIO(csv_bytes))
+    os.makedirs(cache_dir, exist_ok=True)
+    path, marker_path = _dataset_cache_paths(cache_dir)
+    tmp_suffix = f".{os.getpid()}.tmp"
+    feather.write_feather(df, path + tmp_suffix, compression="uncompressed")
+    os.replace(path + tmp_suffix, path)
+    stat = os.stat(path)
+    marker = {
+        "version": DATASET_CACHE_VERSION,
+        "source": LYRICS_AND_CHORDS_KAGGLE_DATASET,
+        "n_bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "n_rows": len(df),
+        "columns": list(df.columns),
+    }
+    with open(marker_path + tmp_suffix, "w") as fp:
+        json.dump(marker, fp, indent=2)
+    os.replace(marker_path + tmp_suffix, marker_path)
+
+
+@lru_cache(maxsize=None)
+def _lyrics_and_chords_table(cache_dir: str):
+    """The dataset, as a memory mapped (so not read until used) pyarrow Table,
+    making its columnar copy first if needed."""
+    import pyarrow.feather as feather
+
+    if not _is_valid_dataset_cache(cache_dir):
+        _make_dataset_cache(cache_dir)
+    path, _ = _dataset_cache_paths(cache_dir)
+    return feather.read_table(path, memory_map=True)
+
+
+@lru_cache(maxsize=8)
+def _lyrics_and_chords_dataframe(columns: Optional[tuple], cache_dir: str):
+    if not _has_pyarrow():  # then there's no columnar copy: parse the CSV
+        df = _lyrics_and_chords_csv_dataframe()
+        return df if columns is None else df[list(columns)]
+    table = _lyrics_and_chords_table(cache_dir)
+    if columns is not None:
+        table = table.select(list(columns))
+    return table.to_pandas()
+
+
+def get_lyrics_and_chords_dataset(
+    columns: Optional[Iterable[str]] = None,
+    *,
+    refresh: bool = False,
+    cache_dir: Optional[str] = None,
+):
+    """The chords and lyrics (Kaggle) dataset, as a DataFrame (of only ``columns``,
+    if given).
+
+    The first time, the dataset is downloaded (with ``haggle``), and a columnar
+    (Feather) copy of it is written in ``cache_dir`` (by default, the directory named
+    by the ``SUNG_DATASET_CACHE_DIR`` environment variable, or
+    ``~/.cache/sung/datasets``), next to a marker of its version, size and
+    modification time (see `_is_valid_dataset_cache`). Later loads, in any process, memory map that copy, and only read the
+    ``columns`` asked for (so that, say, searching titles doesn't read the lyrics).
+    Use ``refresh=True`` to download the dataset again.
+
+    Without ``pyarrow`` (``pip install sung[datasets]`` installs it, and ``haggle``),
+    the dataset is downloaded and parsed in each process.
+    """
+    if cache_dir is None:
+        cache_dir = _default_rootdir(DATASET_CACHE_DIR_ENV_VAR, "datasets")
+    if refresh:
+        _lyrics_and_chords_csv_dataframe.cache_clear()
+        _lyrics_and_chords_table.cache_clear()
+        _lyrics_and_chords_dataframe.cache_clear()
+        if _has_pyarrow():
+            _make_dataset_cache(cache_dir)
+    if columns is not None:
+        columns = tuple(columns)
+    return _lyrics_and_chords_dataframe(columns, cache_dir)
+
+
+def _lyrics_and_chords_rows(indices, cache_dir: Optional[str] = None):
+    """The (whole) rows of the dataset at (positional) ``indices``, with those as
+    index. Only these rows' lyrics are read."""
+    if cache_dir is None:
+        cache_dir = _default_rootdir(DATASET_CACHE_DIR_ENV_VAR, "datasets")
+    if not _has_pyarrow():
+        return _lyrics_and_chords_csv_dataframe().iloc[list(indices)]
+    rows = _lyrics_and_chords_table(cache_dir).take(list(indices)).to_pandas()
+    rows.index = list(indices)
+    return rows
 
 
 def search_songs(title="", *, lyrics="", artist="", data=None):
-    """Search for a song by title, lyrics, or artist."""
-    if data is None:
-        data = get_lyrics_and_chords_dataset()
-    results = data[
-        (data["song_name"].str.contains(title, case=False))
-        & (data["chords&lyrics"].str.contains(lyrics, case=False))
-        & (data["artist_name"].str.contains(artist, case=False))
-    ]
-    return results
+    """Search for a song by title, lyrics, or artist.
+
+    Without ``data``, the title and artist columns of the dataset (see
+    :func:`get_lyrics_and_chords_dataset`) are searched, the lyrics only when
+    ``lyrics`` is given, and the whole rows are then read only for the matches.
+    """
+    if data is not None:
+        return data[
+            (data["song_name"].str.contains(title, case=False))
+            & (data["chords&lyrics"].str.contains(lyrics, case=False))
+            & (data["artist_name"].str.contains(artist, case=False))
+        ]
+    columns = ["song_name", "artist_name"] + (["chords&lyrics"] if lyrics else [])
+    keys = get_lyrics_and_chords_dataset(columns)
+    mask = (keys["song_name"].str.contains(title, case=False, na=False)) & (
+        keys["artist_name"].str.contains(artist, case=False, na=False)
+    )
+    if lyrics:
+        mask &= keys["chords&lyrics"].str.contains(lyrics, case=False, na=False)
+    return _lyrics_and_chords_rows(mask.to_numpy().nonzero()[0])
 
 
 # --------------------------------------------------------------------------------------
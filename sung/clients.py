@@ -0,0 +1,234 @@
+"""A process-wide registry of pooled Spotify clients.
+
+Building a `spotipy.Spotify` client means building an auth manager (and so, often,
+requesting a new token) and a new ``requests`` session (and so, new TCP/TLS
+connections). The registry here builds one client per ``(credentials, scope)`` and
+hands that same client back afterwards, so that its keep-alive connections and its
+cached token are reused.
+
+>>> from sung.clients import pooled_client, client_registry  # doctest: +SKIP
+>>> client = pooled_client(ensure_scope='user-top-read')  # doctest: +SKIP
+>>> client is pooled_client(scope='user-top-read')  # doctest: +SKIP
+True
+>>> client_registry.stats()  # doctest: +SKIP
+{'clients': 1, 'client_hits': 1, 'client_misses': 1, 'connections_opened': 1,
+ 'requests': 12, 'connections_reused': 11}
+
+Pooled clients send their requests through the process-wide
+``sung.throttle.scheduler``, which starts at 10 requests per second with 4 in
+flight, and adapts to what the API sustains (up to 100 per second and 16 in
+flight). Set the ``SUNG_REQUEST_RATE`` and ``SUNG_MAX_CONCURRENCY`` environment
+variables to start elsewhere, or change it in-process:
+
+>>> from sung.throttle import scheduler
+>>> scheduler.configure(rate=5, max_concurrency=8)  # doctest: +SKIP
+
+"""
+
+import os
+import threading
+from hashlib import sha256
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from spotipy import Spotify
+
+from sung.util import get_spotify_client, _add_to_scope
+from sung.throttle import RateLimitScheduler, scheduler as default_scheduler
+
+DFLT_POOL_MAXSIZE = 32
+
+
+def make_pooled_session(
+    pool_maxsize: int = DFLT_POOL_MAXSIZE,
+    *,
+    retries: int = Spotify.max_retries,
+    status_retries: int = Spotify.max_retries,
+    backoff_factor: float = 0.3,
+    status_forcelist=Spotify.default_retry_codes,
+    scheduler: RateLimitScheduler | None = None,
+) -> requests.Session:
+    """Make a keep-alive ``requests`` session able to hold ``pool_maxsize``
+    connections per host, with the same retry policy spotipy gives its own sessions.
+
+    If a ``scheduler`` is given, the session's requests go through it, and it
+    (instead of the session's retry policy) handles 429 responses.
+    """
+    if scheduler is not None:
+        status_forcelist = tuple(code for code in status_forcelist if code != 429)
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        connect=None,
+        read=False,
+        allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+        status=status_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        # With a scheduler, it's the one to honor Retry-After (for all requests)
+        respect_retry_after_header=scheduler is None,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=retry
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if scheduler is not None:
+        scheduler.install(session)
+    return session
+
+
+def _connection_pools(session: requests.Session):
+    for adapter in set(session.adapters.values()):
+        pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+        if pools is not None:
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    yield pool
+
+
+def _hashable(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(map(_hashable, value))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return id(value)
+
+
+class ClientRegistry:
+    """A thread-safe registry of pooled Spotify clients keyed by (credentials, scope).
+
+    Parameters:
+        - pool_maxsize: The number of keep-alive connections each client's session
+          can hold (per host). Set it at least as high as the number of threads
+          that share a client.
+        - client_factory: The function making the clients. It is given the scope,
+          the pooled ``requests_session`` and any other keyword arguments.
+        - scheduler: The `RateLimitScheduler` the clients' requests go through
+          (the process-wide ``sung.throttle.scheduler`` by default; None for none).
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_maxsize: int = DFLT_POOL_MAXSIZE,
+        client_factory=get_spotify_client,
+        scheduler: RateLimitScheduler | None = default_scheduler,
+    ):
+        self.pool_maxsize = pool_maxsize
+        self.client_factory = client_factory
+        self.scheduler = scheduler
+        self._clients: dict[tuple, Spotify] = {}
+        self._sessions: list[requests.Session] = []
+        self._lock = threading.RLock()
+        self._key_locks: dict[tuple, threading.Lock] = {}  # held to make a client
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _key(scope: str, kwargs: dict) -> tuple:
+        client_id = kwargs.get("client_id", os.environ.get("SPOTIFY_API_CLIENT_ID"))
+        client_secret = kwargs.get(
+            "client_secret", os.environ.get("SPOTIFY_API_CLIENT_SECRET")
+        )
+        # Don't keep secrets around in keys, just a fingerprint of them
+        secret_hash = sha256(str(client_secret).encode()).hexdigest()
+        other_kwargs = {
+            k: v for k, v in kwargs.items() if k not in ("client_id", "client_secret")
+        }
+        return (client_id, secret_hash, scope, _hashable(other_kwargs))
+
+    def get(self, *, scope: str = "", ensure_scope: str = "", **kwargs) -> Spotify:
+        """Get the pooled client for these credentials and scope, making it if needed.
+
+        Takes the same arguments as `sung.util.get_spotify_client` (except
+        ``client``).
+        """
+        scope = _add_to_scope(scope, ensure_scope)
+        key = self._key(scope, kwargs)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._hits += 1
+                return client
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # The client is made holding only its key's lock: making it may take a while
+        # (say, an interactive authorization), and shouldn't hold up other clients,
+        # while concurrent requests for the same client wait for it to be made once.
+        with key_lock:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is not None:
+                    self._hits += 1
+                    return client
+                self._misses += 1
+            session = kwargs.pop("requests_session", None)
+            if not isinstance(session, requests.Session):
+                session = make_pooled_session(
+                    self.pool_maxsize, scheduler=self.scheduler
+                )
+            client = self.client_factory(
+                ensure_scope=scope, requests_session=session, **kwargs
+            )
+            with self._lock:
+                self._sessions.append(session)
+                self._clients[key] = client
+            return client
+
+    __call__ = get
+
+    def for_client(self, client: Spotify, *, ensure_scope: str = "") -> Spotify:
+        """Get the pooled client having the credentials of ``client``, and (at least)
+        its scope plus ``ensure_scope``."""
+        auth_manager = client.auth_manager
+        creds = {}
+        if hasattr(auth_manager, "client_id"):
+            creds["client_id"] = auth_manager.client_id
+        if hasattr(auth_manager, "client_secret"):
+            creds["client_secret"] = auth_manager.client_secret
+        if getattr(auth_manager, "redirect_uri", None):
+            creds["redirect_uri"] = auth_manager.redirect_uri
+        scope = getattr(auth_manager, "scope", None) or ""
+        return self.get(scope=scope, ensure_scope=ensure_scope, **creds)
+
+    def clear(self) -> None:
+        """Forget (and close the sessions of) all registered clients."""
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._clients.clear()
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def stats(self) -> dict[str, int]:
+        """Client and connection reuse statistics.
+
+        ``client_hits``/``client_misses`` count calls that got an existing/new
+        client. ``connections_opened`` and ``requests`` are summed over the
+        connection pools of all clients, so ``connections_reused`` is how many
+        requests went over an already open (keep-alive) connection.
+        """
+        with self._lock:
+            pools = [p for s in self._sessions for p in _connection_pools(s)]
+            connections_opened = sum(p.num_connections for p in pools)
+            n_requests = sum(p.num_requests for p in pools)
+            return {
+                "clients": len(self._clients),
+                "client_hits": self._hits,
+                "client_misses": self._misses,
+                "connections_opened": connections_opened,
+                "requests": n_requests,
+                "connections_reused": max(n_requests - connections_opened, 0),
+            }
+
+
+client_registry = ClientRegistry()
+pooled_client = client_registry.get
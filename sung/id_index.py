@@ -0,0 +1,264 @@
+"""A persistent index of ISRCs (and UPCs) to Spotify ids.
+
+Track objects carry their ISRC (in ``external_ids.isrc``), and full album objects
+their UPC, but going from an ISRC to a Spotify track id takes an ``isrc:`` search.
+`IdIndex` keeps ISRC → track id and UPC → album id mappings in a sqlite file, so
+that they're only searched for once.
+
+Once ``enable_id_index()`` is called, the index fills itself from all the track
+metadata fetched from Spotify (by `sung.base.Tracks`, playlist readers and track
+searches). Nothing is enabled on import: the ``SUNG_ID_INDEX_PATH`` environment
+variable only says where the default index file is.
+
+`lookup_isrcs` answers from the index first, and searches (concurrently) only for
+the ISRCs it doesn't know.
+
+>>> index = IdIndex(':memory:')
+>>> index.add_track_metas([
+...     {'id': '4uLU6hMCjMI75M1A2tKUQC', 'external_ids': {'isrc': 'gb-emi-76-00001'}},
+...     {'id': '3n3Ppam7vgaVa1iaRUc9Lp', 'external_ids': {}},
+... ])
+1
+>>> index.track_ids_for_isrcs(['GBEMI7600001', 'USUM70000000'])
+{'GBEMI7600001': '4uLU6hMCjMI75M1A2tKUQC'}
+
+"""
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable, Mapping
+
+from sung.util import extractor
+from sung.base import track_metas_observers
+from sung.search import search_many, DFLT_SEARCH_MAX_WORKERS
+
+ID_INDEX_PATH_ENV_VAR = "SUNG_ID_INDEX_PATH"
+
+
+def _default_path() -> str:
+    return os.environ.get(ID_INDEX_PATH_ENV_VAR) or os.path.join(
+        os.path.expanduser("~"), ".cache", "sung", "id_index.sqlite"
+    )
+
+
+def normalize_code(code: str) -> str:
+    """Normalize an ISRC or UPC (upper case, no dashes or spaces).
+
+    >>> normalize_code(' us-rc1-76-07839 ')
+    'USRC17607839'
+    """
+    return "".join(code.split()).replace("-", "").upper()
+
+
+class IdIndex:
+    """A sqlite-backed index of ISRC → track id and UPC → album id.
+
+    Parameters:
+        - path: The sqlite file (made if needed). By default, the one named by the
+          ``SUNG_ID_INDEX_PATH`` environment variable, or
+          ``~/.cache/sung/id_index.sqlite``. Use ``':memory:'`` for a
+          non-persistent index.
+    """
+
+    def __init__(self, path: str | None = None):
+        if path is None:
+            path = _default_path()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS isrc (isrc TEXT PRIMARY KEY, track_id TEXT)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS upc (upc TEXT PRIMARY KEY, album_id TEXT)"
+            )
+
+    def _add(self, table: str, pairs: Iterable[tuple[str, str]]) -> int:
+        pairs = list(pairs)
+        if pairs:
+            with self._lock, self._connection:
+                self._connection.executemany(
+                    f"INSERT OR REPLACE INTO {table} VALUES (?, ?)", pairs
+                )
+        return len(pairs)
+
+    def _get(self, table: str, value_column: str, codes: Iterable[str]) -> dict:
+        codes = list(dict.fromkeys(map(normalize_code, codes)))
+        found = {}
+        with self._lock:
+            # (sqlite limits the number of parameters of a query)
+            for i in range(0, len(codes), 500):
+                chunk = codes[i : i + 500]
+                rows = self._connection.execute(
+                    f"SELECT {table}, {value_column} FROM {table} "
+                    f"WHERE {table} IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                found.update(rows)
+        return found
+
+    def add_track_metas(self, track_metas: Iterable[dict]) -> int:
+        """Index the ISRCs of tracks (and the UPCs of their albums, when they have
+        them). Returns the number of ISRCs indexed."""
+        isrc_pairs, upc_pairs = [], []
+        for meta in track_metas:
+            if not meta or not meta.get("id"):
+                continue
+            isrc = (meta.get("external_ids") or {}).get("isrc")
+            if isrc:
+                isrc_pairs.append((normalize_code(isrc), meta["id"]))
+            album = meta.get("album") or {}
+            upc = (album.get("external_ids") or {}).get("upc")
+            if upc and album.get("id"):
+                upc_pairs.append((normalize_code(upc), album["id"]))
+        self._add("upc", upc_pairs)
+        return self._add("isrc", isrc_pairs)
+
+    def add_album_metas(self, album_metas: Iterable[dict]) -> int:
+        """Index the UPCs of (full) album objects. Returns the number indexed."""
+        return self._add(
+            "upc",
+            (
+                (normalize_code(upc), meta["id"])
+                for meta in album_metas
+                if meta and meta.get("id")
+                if (upc := (meta.get("external_ids") or {}).get("upc"))
+            ),
+        )
+
+    def add_upcs(self, album_ids: Mapping[str, str] | Iterable[tuple[str, str]]) -> int:
+        """Index ``{upc: album_id}`` pairs (a mapping, or an iterable of pairs) known
+        from elsewhere, e.g. a ``upc:`` search. Returns the number indexed.
+
+        >>> index = IdIndex(':memory:')
+        >>> index.add_upcs({'00602537518357': '1ATL5GLyefJaxhQzSPVrLX'})
+        1
+        >>> index.album_ids_for_upcs(['00602537518357'])
+        {'00602537518357': '1ATL5GLyefJaxhQzSPVrLX'}
+        """
+        if isinstance(album_ids, Mapping):
+            album_ids = album_ids.items()
+        return self._add(
+            "upc", ((normalize_code(upc), album_id) for upc, album_id in album_ids)
+        )
+
+    def track_ids_for_isrcs(self, isrcs: Iterable[str]) -> dict[str, str]:
+        """The indexed ``{isrc: track_id}`` of those of ``isrcs`` that are indexed."""
+        return self._get("isrc", "track_id", isrcs)
+
+    def album_ids_for_upcs(self, upcs: Iterable[str]) -> dict[str, str]:
+        """The indexed ``{upc: album_id}`` of those of ``upcs`` that are indexed."""
+        return self._get("upc", "album_id", upcs)
+
+    def __len__(self) -> int:
+        with self._lock:
+            (n,) = self._connection.execute("SELECT COUNT(*) FROM isrc").fetchone()
+        return n
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+id_index: IdIndex | None = None  # The index filled by (and used for) lookups
+
+
+def enable_id_index(index: IdIndex | None = None, **kwargs) -> IdIndex:
+    """Make ``index`` (or a new `IdIndex` made with ``kwargs``) the default index,
+    filled with all the track metadata fetched from Spotify. Returns it."""
+    global id_index
+    disable_id_index()
+    id_index = index if index is not None else IdIndex(**kwargs)
+    track_metas_observers.append(id_index.add_track_metas)
+    return id_index
+
+
+def disable_id_index() -> None:
+    """Stop filling the default index (if any) from fetched tracks."""
+    global id_index
+    if id_index is not None:
+        if id_index.add_track_metas in track_metas_observers:
+            track_metas_observers.remove(id_index.add_track_metas)
+        id_index = None
+
+
+def _ensure_index(index: IdIndex | None) -> IdIndex:
+    if index is not None:
+        return index
+    return id_index if id_index is not None else enable_id_index()
+
+
+DFLT_LOOKUP_SEARCH_LIMIT = 5
+
+
+def lookup_isrcs(
+    isrcs: Iterable[str],
+    *,
+    index: IdIndex | None = None,
+    market=None,
+    max_workers: int = DFLT_SEARCH_MAX_WORKERS,
+    client=None,
+) -> dict[str, str | None]:
+    """Get the Spotify track ids of ISRCs, as a ``{isrc: track_id_or_None}`` dict
+    (with normalized ISRCs as keys, in the order of ``isrcs``).
+
+    ISRCs are looked up in ``index`` (the default one, by default) first. The others
+    are searched for (``isrc:`` searches), concurrently, and the tracks found are
+    added to the index.
+    """
+    index = _ensure_index(index)
+    isrcs = list(dict.fromkeys(map(normalize_code, isrcs)))
+    found = index.track_ids_for_isrcs(isrcs)
+    missing = [isrc for isrc in isrcs if isrc not in found]
+    if missing:
+        results = search_many(
+            [f"isrc:{isrc}" for isrc in missing],
+            extractor("tracks.items"),
+            search_type="track",
+            market=market,
+            limit=DFLT_LOOKUP_SEARCH_LIMIT,
+            max_workers=max_workers,
+            client=client,
+        )
+        for track_metas in results:
+            index.add_track_metas(track_metas)
+        # Only keep tracks that really have the ISRC (searches can be fuzzy)
+        found.update(index.track_ids_for_isrcs(missing))
+    return {isrc: found.get(isrc) for isrc in isrcs}
+
+
+def lookup_upcs(
+    upcs: Iterable[str],
+    *,
+    index: IdIndex | None = None,
+    market=None,
+    max_workers: int = DFLT_SEARCH_MAX_WORKERS,
+    client=None,
+) -> dict[str, str | None]:
+    """Get the Spotify album ids of UPCs, as a ``{upc: album_id_or_None}`` dict.
+
+    Like `lookup_isrcs`, but with ``upc:`` album searches. (Albums in search results
+    don't say what their UPC is, so the first album found is taken.)
+    """
+    index = _ensure_index(index)
+    upcs = list(dict.fromkeys(map(normalize_code, upcs)))
+    found = index.album_ids_for_upcs(upcs)
+    missing = [upc for upc in upcs if upc not in found]
+    if missing:
+        results = search_many(
+            [f"upc:{upc}" for upc in missing],
+            extractor("albums.items"),
+            search_type="album",
+            market=market,
+            limit=1,
+            max_workers=max_workers,
+            client=client,
+        )
+        new = {upc: items[0]["id"] for upc, items in zip(missing, results) if items}
+        index.add_upcs(new)
+        found.update(new)
+    return {upc: found.get(upc) for upc in upcs}
@@ -0,0 +1,445 @@
+"""Bulk and positional write operations on Spotify playlists.
+
+The Spotify API takes at most 100 items per playlist write, so large writes are
+sequences of batches. The tools here make those sequences robust:
+
+- `bulk_add_items` adds items at explicit positions, so their order is kept, and
+  retries failed batches idempotently: after a failure, the playlist's total (and
+  ``snapshot_id``) tell whether the batch landed before it's posted again. Progress
+  is reported through a callback, and a checkpoint file lets a run that died
+  partway resume where it stopped.
+- `plan_sync` computes a small list of removals, moves and insertions turning a
+  playlist's items into a target list, keeping the longest run of items already in
+  the right order in place (so they keep their ``added_at``), and `send_ops` sends
+  them, in batches.
+- `plan_moves` plans the range moves reordering a playlist (see `Playlist.reorder`),
+  and `RemoveOp` removes items by position (see `Playlist.remove_positions`).
+
+"""
+
+import os
+import json
+import time
+from dataclasses import dataclass, asdict
+from hashlib import sha256
+from typing import Any, NamedTuple, Optional, Union
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+
+import requests
+from spotipy.exceptions import SpotifyException
+
+MAX_ITEMS_PER_WRITE = 100
+DFLT_MAX_RETRIES = 3
+TRANSIENT_HTTP_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+ProgressCallback = Callable[[int, int], Any]
+
+
+def is_transient_error(error: Exception) -> bool:
+    """True if ``error`` is worth retrying (network trouble, throttling, 5xx)."""
+    if isinstance(error, SpotifyException):
+        return error.http_status in TRANSIENT_HTTP_STATUSES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def playlist_state(client, playlist_id: str) -> tuple[int, str]:
+    """Get the ``(total, snapshot_id)`` of a playlist, in one (small) request."""
+    info = client.playlist(playlist_id, fields="snapshot_id,tracks.total")
+    return info["tracks"]["total"], info["snapshot_id"]
+
+
+@dataclass
+class BulkAddCheckpoint:
+    """What a bulk add needs to know to resume."""
+
+    playlist_id: str
+    fingerprint: str  # of the items to add, so we don't resume a different run
+    start_position: int
+    base_total: int  # number of items in the playlist before the run
+    n_added: int = 0
+    snapshot_id: Optional[str] = None
+
+    @staticmethod
+    def items_fingerprint(items: Sequence[str]) -> str:
+        return sha256("\n".join(items).encode()).hexdigest()
+
+    @classmethod
+    def load(cls, path: str) -> Optional["BulkAddCheckpoint"]:
+        try:
+            with open(path) as fp:
+                return cls(**json.load(fp))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(asdict(self), fp)
+        os.replace(tmp_path, path)
+
+
+def bulk_add_items(
+    client,
+    playlist_id: str,
+    items: Sequence[str],
+    *,
+    position: int | None = None,
+    batch_size: int = MAX_ITEMS_PER_WRITE,
+    max_retries: int = DFLT_MAX_RETRIES,
+    on_progress: ProgressCallback | None = None,
+    checkpoint_path: str | None = None,
+    playlist_total: int | None = None,
+    snapshot_id: str | None = None,
+) -> str | None:
+    """
+    Add items (track uris, ids or urls) to a playlist, in order, robustly.
+
+    Parameters:
+        - client: The Spotify client to write with.
+        - playlist_id: The playlist to add items to.
+        - items: The items to add.
+        - position: Where to insert the items (at the end, by default).
+        - batch_size: How many items to add per request (at most 100).
+        - max_retries: How many times to retry a batch failing with a transient error.
+        - on_progress: Called with ``(n_added, n_items)`` after each batch.
+        - checkpoint_path: A file to record progress in, after each batch. If it holds
+          the checkpoint of a previous (dead) run adding the same items to the same
+          playlist, that run is resumed. The file is removed once all items are added.
+        - playlist_total, snapshot_id: The current number of items and snapshot of
+          the playlist, if known (saves a request, e.g. for a new, empty, playlist).
+
+    Returns:
+        The ``snapshot_id`` of the playlist after the last batch.
+
+    Every batch is added at an explicit position, following the previous one. When a
+    batch fails, the playlist's total tells whether it landed anyway (e.g. the
+    response was lost), in which case it's not added again.
+    """
+    items = list(items)
+    batch_size = min(batch_size, MAX_ITEMS_PER_WRITE)
+    fingerprint = BulkAddCheckpoint.items_fingerprint(items)
+
+    checkpoint = None
+    if checkpoint_path is not None:
+        checkpoint = BulkAddCheckpoint.load(checkpoint_path)
+        if checkpoint is not None and (
+            checkpoint.playlist_id != playlist_id
+            or checkpoint.fingerprint != fingerprint
+        ):
+            checkpoint = None  # a checkpoint of something else: start afresh
+
+    if checkpoint is None:
+        if playlist_total is None:
+            playlist_total, snapshot_id = playlist_state(client, playlist_id)
+        start_position = playlist_total if position is None else position
+        checkpoint = BulkAddCheckpoint(
+            playlist_id, fingerprint, start_position, playlist_total, 0, snapshot_id
+        )
+    else:
+        # A batch of the previous run may have landed after its last checkpoint
+        # (this assumes nobody else edited the playlist meanwhile).
+        playlist_total, checkpoint.snapshot_id = playlist_state(client, playlist_id)
+        n_landed = playlist_total - checkpoint.base_total
+        if checkpoint.n_added < n_landed <= len(items):
+            checkpoint.n_added = n_landed
+
+    if on_progress is not None:
+        on_progress(checkpoint.n_added, len(items))
+
+    while checkpoint.n_added < len(items):
+        n_added = checkpoint.n_added
+        batch = items[n_added : n_added + batch_size]
+        expected_total = checkpoint.base_total + n_added + len(batch)
+        for attempt in range(max_retries + 1):
+            try:
+                response = client.playlist_add_items(
+                    playlist_id, batch, position=checkpoint.start_position + n_added
+                )
+                checkpoint.snapshot_id = response["snapshot_id"]
+                break
+            except Exception as error:
+                if attempt >= max_retries or not is_transient_error(error):
+                    raise
+                time.sleep(min(2**attempt, 30))
+                total, snapshot_id = playlist_state(client, playlist_id)
+                if total == expected_total and snapshot_id != checkpoint.snapshot_id:
+                    # The batch landed; only its response got lost
+                    checkpoint.snapshot_id = snapshot_id
+                    break
+                if total != expected_total - len(batch):
+                    raise RuntimeError(
+                        f"Playlist {playlist_id} was modified during a bulk add "
+                        f"(has {total} items, expected {expected_total - len(batch)})"
+                    ) from error
+        checkpoint.n_added += len(batch)
+        if checkpoint_path is not None:
+            checkpoint.save(checkpoint_path)
+        if on_progress is not None:
+            on_progress(checkpoint.n_added, len(items))
+
+    if checkpoint_path is not None and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return checkpoint.snapshot_id
+
+
+# --------------------------------------------------------------------------------------
+# Planning edits: removals, moves and insertions
+
+
+class RemoveOp(NamedTuple):
+    """Remove the items at these ``(item, position)`` pairs (positions before removal)."""
+
+    items: tuple
+
+
+class MoveOp(NamedTuple):
+    """Move ``range_length`` items from ``range_start`` to before ``insert_before``
+    (both positions before the move), as ``playlist_reorder_items`` does."""
+
+    range_start: int
+    insert_before: int
+    range_length: int = 1
+
+
+class InsertOp(NamedTuple):
+    """Insert ``items`` at ``position``."""
+
+    position: int
+    items: tuple
+
+
+PlaylistOp = Union[RemoveOp, MoveOp, InsertOp]
+
+
+def apply_op(items: list, op: PlaylistOp) -> list:
+    """Apply an op to a list of items, in place, like the API does to a playlist.
+
+    >>> apply_op(list('abcde'), MoveOp(3, 1, 2))
+    ['a', 'd', 'e', 'b', 'c']
+    >>> apply_op(list('abcde'), RemoveOp((('b', 1), ('d', 3))))
+    ['a', 'c', 'e']
+    >>> apply_op(list('abc'), InsertOp(1, ('x', 'y')))
+    ['a', 'x', 'y', 'b', 'c']
+    """
+    if isinstance(op, RemoveOp):
+        for item, position in sorted(op.items, key=lambda x: x[1], reverse=True):
+            if items[position] != item:
+                raise ValueError(f"Item at {position} is {items[position]}, not {item}")
+            del items[position]
+    elif isinstance(op, MoveOp):
+        start, before, length = op
+        block = items[start : start + length]
+        del items[start : start + length]
+        if before > start:
+            before -= length
+        items[before:before] = block
+    elif isinstance(op, InsertOp):
+        items[op.position : op.position] = op.items
+    else:
+        raise TypeError(f"Unknown op: {op!r}")
+    return items
+
+
+def apply_ops(items, ops) -> list:
+    """Return a list of the items resulting from applying ``ops`` to ``items``."""
+    items = list(items)
+    for op in ops:
+        apply_op(items, op)
+    return items
+
+
+def _longest_increasing_subsequence(seq: Sequence[int]) -> set:
+    """The values of a longest (strictly) increasing subsequence of ``seq``.
+
+    >>> sorted(_longest_increasing_subsequence([3, 0, 1, 4, 2, 5]))
+    [0, 1, 2, 5]
+    """
+    tails, tail_idx, prev = [], [], [None] * len(seq)
+    for i, x in enumerate(seq):
+        k = bisect_left(tails, x)
+        if k == len(tails):
+            tails.append(x)
+            tail_idx.append(i)
+        else:
+            tails[k] = x
+            tail_idx[k] = i
+        prev[i] = tail_idx[k - 1] if k else None
+    result, i = set(), tail_idx[-1] if tail_idx else None
+    while i is not None:
+        result.add(seq[i])
+        i = prev[i]
+    return result
+
+
+def _runs(items: Sequence[int], rank: dict) -> list[list[int]]:
+    """Split items into maximal runs of adjacent items with consecutive ranks."""
+    runs = []
+    for item in items:
+        if runs and rank[item] == rank[runs[-1][-1]] + 1:
+            runs[-1].append(item)
+        else:
+            runs.append([item])
+    return runs
+
+
+def plan_moves(order: Sequence[int]) -> list[MoveOp]:
+    """Plan (range) moves sorting ``order``, a list of distinct integers.
+
+    The list is cut into runs: maximal stretches of items that are already adjacent
+    and in sorted order. The runs of a longest increasing sequence of runs stay in
+    place; every other run is moved, whole, to right after its predecessor. Runs that
+    end up adjacent are moved together. So the number of moves is (at most) the
+    number of runs that are out of place, whatever their lengths.
+
+    >>> ops = plan_moves([4, 5, 0, 1, 2, 3])
+    >>> ops
+    [MoveOp(range_start=0, insert_before=6, range_length=2)]
+    >>> apply_ops([4, 5, 0, 1, 2, 3], ops)
+    [0, 1, 2, 3, 4, 5]
+    >>> len(plan_moves([10, 11, 12, 1, 2, 20, 21, 3, 4, 5]))
+    2
+    """
+    items = list(order)
+    ordered = sorted(items)
+    rank = {item: r for r, item in enumerate(ordered)}
+    runs = _runs(items, rank)
+    stable_run_starts = _longest_increasing_subsequence([run[0] for run in runs])
+    stable = {item for run in runs if run[0] in stable_run_starts for item in run}
+    ops = []
+    i = 0
+    while i < len(ordered):
+        x = ordered[i]
+        if x in stable:
+            i += 1
+            continue
+        start = items.index(x)
+        length = 1
+        while (
+            i + length < len(ordered)
+            and ordered[i + length] not in stable
+            and start + length < len(items)
+            and items[start + length] == ordered[i + length]
+        ):
+            length += 1
+        if i == 0:
+            insert_before = 0
+        else:
+            insert_before = items.index(ordered[i - 1]) + 1
+        if insert_before != start:  # (not already in place)
+            op = MoveOp(start, insert_before, length)
+            apply_op(items, op)
+            ops.append(op)
+        i += length
+    return ops
+
+
+def plan_sync(current: Sequence[str], target: Sequence[str]) -> list[PlaylistOp]:
+    """
+    Plan the ops turning the ``current`` items of a playlist into ``target`` items.
+
+    The k-th occurrence of an item in ``target`` is matched with its k-th occurrence
+    in ``current``, if any. Unmatched current items are removed, matched items are
+    reordered with `plan_moves` (so the longest subsequence already in order stays in
+    place), and unmatched target items are inserted, in runs.
+
+    >>> current = ['a', 'b', 'c', 'd', 'e']
+    >>> target = ['b', 'c', 'x', 'a', 'e']
+    >>> ops = plan_sync(current, target)
+    >>> ops  # doctest: +NORMALIZE_WHITESPACE
+    [RemoveOp(items=(('d', 3),)),
+     MoveOp(range_start=0, insert_before=3, range_length=1),
+     InsertOp(position=2, items=('x',))]
+    >>> apply_ops(current, ops) == target
+    True
+    """
+    occurrences = defaultdict(list)  # item -> positions in current
+    for position, item in enumerate(current):
+        occurrences[item].append(position)
+    seen = defaultdict(int)
+    matched = {}  # current position -> target position
+    unmatched_target = []
+    for t, item in enumerate(target):
+        k = seen[item]
+        seen[item] += 1
+        if k < len(occurrences[item]):
+            matched[occurrences[item][k]] = t
+        else:
+            unmatched_target.append(t)
+
+    ops = []
+    to_remove = tuple(
+        (item, position)
+        for position, item in enumerate(current)
+        if position not in matched
+    )
+    if to_remove:
+        ops.append(RemoveOp(to_remove))
+
+    # What's left, in current order, identified by target position
+    order = [matched[position] for position in sorted(matched)]
+    ops.extend(plan_moves(order))
+
+    # Insert runs of consecutive target positions (all earlier ones are then in place)
+    run = []
+    for t in unmatched_target + [None]:
+        if run and (t is None or t != run[-1] + 1):
+            ops.append(InsertOp(run[0], tuple(target[i] for i in run)))
+            run = []
+        if t is not None:
+            run.append(t)
+    return ops
+
+
+def _batched_ops(ops, batch_size=MAX_ITEMS_PER_WRITE):
+    """Split ops so that none removes or inserts more than ``batch_size`` items.
+
+    Removals are split starting from the end of the playlist, so that a batch's
+    positions aren't shifted by the batches before it.
+    """
+    for op in ops:
+        if isinstance(op, RemoveOp):
+            items = sorted(op.items, key=lambda x: x[1], reverse=True)
+            for i in range(0, len(items), batch_size):
+                yield RemoveOp(tuple(items[i : i + batch_size]))
+        elif isinstance(op, InsertOp):
+            for i in range(0, len(op.items), batch_size):
+                yield InsertOp(op.position + i, op.items[i : i + batch_size])
+        else:
+            yield op
+
+
+def send_ops(client, playlist_id: str, ops, *, snapshot_id: str | None = None):
+    """Send ops to a playlist, in batches of at most 100 items.
+
+    Removals and moves are tied to the snapshot they were planned on (and then to
+    the snapshot each op returns), so the API refuses them if positions changed.
+    Returns the ``snapshot_id`` after the last op.
+    """
+    from sung.util import cast_track_key
+
+    for op in _batched_ops(ops):
+        if isinstance(op, RemoveOp):
+            by_uri = defaultdict(list)
+            for item, position in op.items:
+                by_uri[cast_track_key(item, "uri")].append(position)
+            response = client.playlist_remove_specific_occurrences_of_items(
+                playlist_id,
+                [{"uri": uri, "positions": p} for uri, p in by_uri.items()],
+                snapshot_id=snapshot_id,
+            )
+        elif isinstance(op, MoveOp):
+            response = client.playlist_reorder_items(
+                playlist_id,
+                range_start=op.range_start,
+                insert_before=op.insert_before,
+                range_length=op.range_length,
+                snapshot_id=snapshot_id,
+            )
+        else:
+            response = client.playlist_add_items(
+                playlist_id, list(op.items), position=op.position
+            )
+        snapshot_id = response["snapshot_id"]
+    return snapshot_id
@@ -23,12 +23,20 @@ The lower-level :func:`resolve_song` returns the chosen match plus the full
 ranked candidate list, which the CLI uses to surface ambiguous matches.
 """
 
-from dataclasses import dataclass, field
-from typing import Any, Optional, Union
-from collections.abc import Iterable, Sequence
-
-from sung.base import Playlist, search_tracks
+from dataclasses import dataclass, field, asdict, replace
+from typing import Any, NamedTuple, Optional, Union
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+import os
+import copy
+import json
+import threading
+
+from sung.base import Playlist, PlaylistReader, search_tracks
 from sung.util import get_spotify_client, ensure_client
+from sung.caching import ResolutionMemo, resolve_resolution_memo
+from sung.song_tables import iter_song_table, song_table_format
 
 SongDescriptor = Union[str, tuple, dict]
 
@@ -124,60 +132,389 @@ def _same_song(a: dict, b: dict) -> bool:
     a compilation, a deluxe edition, and a live release. We don't want to flag
     those as ambiguous — the user gets the same song either way.
     """
-    if _normalize(a.get("name", "")) != _normalize(b.get("name", "")):
-        return False
-    a_artists = {_normalize(x["name"]) for x in a.get("artists", [])}
-    b_artists = {_normalize(x["name"]) for x in b.get("artists", [])}
-    return bool(a_artists & b_artists)
+    return default_scorer.same_song(a, b)
 
 
 def _score_candidate(
     candidate: dict, query_name: str, query_artist: Optional[str]
 ) -> float:
     """Score a candidate track against the query. Higher is better."""
-    score = 0.0
+    return default_scorer.score(candidate, query_name, query_artist)
 
-    cand_name = candidate.get("name", "")
-    cand_artists = [a["name"] for a in candidate.get("artists", [])]
 
-    qn = _normalize(query_name)
-    cn = _normalize(cand_name)
+# --------------------------------------------------------------------------------------
+# Candidate scoring
 
-    # Title match: exact > prefix > substring
-    if cn == qn:
-        score += 100
-    elif cn.startswith(qn) or qn.startswith(cn):
-        score += 60
-    elif qn in cn or cn in qn:
-        score += 30
-
-    # Artist match (only if user provided one)
-    if query_artist:
-        qa = _normalize(query_artist)
-        artist_normed = [_normalize(a) for a in cand_artists]
-        if any(a == qa for a in artist_normed):
-            score += 80
-        elif any(qa in a or a in qa for a in artist_normed):
-            score += 40
-        else:
-            # User specified an artist but no candidate artist matched; penalize
-            score -= 50
 
+@dataclass(frozen=True)
+class ScoringWeights:
+    """The weights of the criteria :class:`CandidateScorer` scores candidates with."""
+
+    # Title match: exact > prefix > substring
+    title_exact: float = 100
+    title_prefix: float = 60
+    title_substring: float = 30
+    # Artist match (only if the query has an artist)
+    artist_exact: float = 80
+    artist_partial: float = 40
+    artist_mismatch: float = -50
     # Light popularity tiebreaker (0..100 → 0..10)
-    score += (candidate.get("popularity") or 0) / 10.0
+    popularity_divisor: float = 10.0
+    # Alternate-version markers the query didn't ask for
+    remix: float = -5
+    live: float = -3
+    karaoke_or_tribute: float = -30
+    # Weight of the (optional) fuzzy title similarity, in 0..1
+    title_similarity: float = 0
+
+
+@dataclass(frozen=True)
+class _Query:
+    name: str
+    artist: Optional[str]
+    normalized_name: str
+    normalized_artist: Optional[str]
+    name_lower: str
+    remix_wanted: bool
+
+
+@dataclass(frozen=True)
+class _CandidateFields:
+    normalized_name: str
+    normalized_artists: tuple
+    normalized_artist_set: frozenset
+    name_lower: str
+
+
+Similarity = Callable[[str, str], float]
+
+
+class CandidateScorer:
+    """Scores candidate tracks against song queries, in batch.
+
+    Queries are normalized once per batch, and the normalized fields of candidates
+    are cached (by track id and name, for candidates that have an id), so re-scoring large pools of candidates
+    (e.g. re-ranking memoized matches under other weights) costs little more than
+    the arithmetic.
+
+    Parameters:
+        - weights: The :class:`ScoringWeights` (the defaults give the same scores as
+          :func:`resolve_song` always gave).
+        - similarity: An optional fuzzy similarity function of two normalized titles,
+          in 0..1 (e.g. ``lambda a, b: difflib.SequenceMatcher(None, a, b).ratio()``),
+          whose value, times ``weights.title_similarity``, is added to scores.
+        - cache_size: How many candidates' normalized fields to keep.
+
+    Candidates are track dicts, whose ``artists`` are dicts (with a ``name``) or
+    just names (as in :attr:`SongMatch.candidates`).
+
+    >>> scorer = CandidateScorer()
+    >>> candidates = [
+    ...     {'id': '1', 'name': 'Clocks - Live', 'artists': [{'name': 'Coldplay'}]},
+    ...     {'id': '2', 'name': 'Clocks', 'artists': [{'name': 'Coldplay'}]},
+    ... ]
+    >>> [(c['id'], score) for c, score in scorer.rank(candidates, 'Clocks', 'Coldplay')]
+    [('2', 180.0), ('1', 137.0)]
+    """
+
+    def __init__(
+        self,
+        weights: ScoringWeights = ScoringWeights(),
+        *,
+        similarity: Optional[Similarity] = None,
+        cache_size: int = 100_000,
+    ):
+        self.weights = weights
+        self.similarity = similarity
+        self.cache_size = cache_size
+        self._fields_cache: dict[tuple, _CandidateFields] = {}
+
+    @staticmethod
+    def query(name: str, artist: Optional[str] = None) -> _Query:
+        """Normalize a query (once, for all the candidates it's scored against)."""
+        return _Query(
+            name=name,
+            artist=artist,
+            normalized_name=_normalize(name),
+            normalized_artist=_normalize(artist) if artist else None,
+            name_lower=name.lower(),
+            remix_wanted=bool(artist) and "remix" in artist.lower(),
+        )
+
+    def fields(self, candidate: dict) -> _CandidateFields:
+        """The normalized fields of a candidate (cached)."""
+        name = candidate.get("name", "")
+        key = (candidate.get("id"), name)
+        fields = self._fields_cache.get(key) if key[0] is not None else None
+        if fields is None:
+            artists = tuple(
+                _normalize(a if isinstance(a, str) else a["name"])
+                for a in candidate.get("artists", [])
+            )
+            fields = _CandidateFields(
+                normalized_name=_normalize(name),
+                normalized_artists=artists,
+                normalized_artist_set=frozenset(artists),
+                name_lower=name.lower(),
+            )
+            if key[0] is not None:
+                if len(self._fields_cache) >= self.cache_size:
+                    self._fields_cache.clear()
+                self._fields_cache[key] = fields
+        return fields
+
+    def _score(self, candidate: dict, query: _Query) -> float:
+        w = self.weights
+        fields = self.fields(candidate)
+        qn, cn = query.normalized_name, fields.normalized_name
+        score = 0.0
+
+        if cn == qn:
+            score += w.title_exact
+        elif cn.startswith(qn) or qn.startswith(cn):
+            score += w.title_prefix
+        elif qn in cn or cn in qn:
+            score += w.title_substring
+
+        if query.artist:
+            qa = query.normalized_artist
+            if qa in fields.normalized_artist_set:
+                score += w.artist_exact
+            elif any(qa in a or a in qa for a in fields.normalized_artists):
+                score += w.artist_partial
+            else:
+                score += w.artist_mismatch
+
+        score += (candidate.get("popularity") or 0) / w.popularity_divisor
+
+        name_lower = fields.name_lower
+        if not query.remix_wanted and "remix" in name_lower:
+            score += w.remix
+        if "live" in name_lower and "live" not in query.name_lower:
+            score += w.live
+        if "karaoke" in name_lower or "tribute" in name_lower:
+            score += w.karaoke_or_tribute
+
+        if self.similarity is not None and w.title_similarity:
+            score += w.title_similarity * self.similarity(qn, cn)
+        return score
+
+    def score(
+        self, candidate: dict, query_name: str, query_artist: Optional[str] = None
+    ) -> float:
+        """Score one candidate against a query. Higher is better."""
+        return self._score(candidate, self.query(query_name, query_artist))
+
+    def score_many(
+        self,
+        candidates: Iterable[dict],
+        query_name: str,
+        query_artist: Optional[str] = None,
+    ) -> list[float]:
+        """Score candidates against a query (normalized once)."""
+        query = self.query(query_name, query_artist)
+        return [self._score(candidate, query) for candidate in candidates]
+
+    def rank(
+        self,
+        candidates: Iterable[dict],
+        query_name: str,
+        query_artist: Optional[str] = None,
+    ) -> list[tuple[dict, float]]:
+        """``(candidate, score)`` pairs, best first (ties keep their order)."""
+        candidates = list(candidates)
+        scores = self.score_many(candidates, query_name, query_artist)
+        return sorted(zip(candidates, scores), key=lambda x: x[1], reverse=True)
+
+    def same_song(self, a: dict, b: dict) -> bool:
+        """True when two candidates have the same (normalized) title and share an
+        artist. See ``_same_song``."""
+        a_fields, b_fields = self.fields(a), self.fields(b)
+        if a_fields.normalized_name != b_fields.normalized_name:
+            return False
+        return not a_fields.normalized_artist_set.isdisjoint(
+            b_fields.normalized_artist_set
+        )
+
+
+default_scorer = CandidateScorer()
 
-    # Mildly prefer non-explicit-remix / non-live versions: penalize obvious
-    # alternate-version markers if the user didn't ask for them.
-    name_lower = cand_name.lower()
-    if not query_artist or "remix" not in query_artist.lower():
-        if "remix" in name_lower:
-            score -= 5
-    if "live" in name_lower and "live" not in query_name.lower():
-        score -= 3
-    if "karaoke" in name_lower or "tribute" in name_lower:
-        score -= 30
 
-    return score
+# --------------------------------------------------------------------------------------
+# Adaptive (early exit) search
+
+DFLT_ADAPTIVE_INITIAL_LIMIT = 3
+
+
+class AdaptiveSearchStats:
+    """Counts the requests made and bytes received by adaptive resolutions, and
+    (estimates of) what the non-adaptive strategy would have taken.
+
+    Bytes are those of the JSON responses (as decoded, so not compressed). The
+    baseline's are estimated from the sizes of the items actually received.
+    Note that adaptive resolution saves bytes, not requests: when it has to widen a
+    search, it makes one more request than the baseline.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.resolutions = 0
+        self.early_exits = 0
+        self.requests = 0
+        self.baseline_requests = 0
+        self.bytes = 0
+        self.baseline_bytes = 0
+
+    def record(
+        self,
+        *,
+        early_exit: bool,
+        requests: int,
+        baseline_requests: int,
+        n_bytes: int,
+        baseline_bytes: int,
+    ) -> None:
+        with self._lock:
+            self.resolutions += 1
+            self.early_exits += early_exit
+            self.requests += requests
+            self.baseline_requests += baseline_requests
+            self.bytes += n_bytes
+            self.baseline_bytes += baseline_bytes
+
+    @property
+    def requests_saved(self) -> int:
+        return self.baseline_requests - self.requests
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.baseline_bytes - self.bytes
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                "resolutions": self.resolutions,
+                "early_exits": self.early_exits,
+                "requests": self.requests,
+                "requests_saved": self.requests_saved,
+                "bytes": self.bytes,
+                "bytes_saved": self.bytes_saved,
+            }
+
+
+adaptive_search_stats = AdaptiveSearchStats()
+
+
+def _json_size(obj) -> int:
+    return len(json.dumps(obj, ensure_ascii=False).encode())
+
+
+class _SizedSearch:
+    """Searches for tracks, keeping track of requests and response sizes, and of
+    what getting ``search_limit`` items at once would have taken."""
+
+    def __init__(self, *, market, search_limit, client):
+        self.market = market
+        self.search_limit = search_limit
+        self.client = client
+        self.requests = 0
+        self.n_bytes = 0
+        self.baseline_bytes = 0
+
+    def __call__(self, query, limit, offset=0, *, baseline=True):
+        results = search_tracks(
+            query=query,
+            egress=lambda results: results,
+            market=self.market,
+            limit=limit,
+            offset=offset,
+            client=self.client,
+        )
+        page = results.get("tracks") or {}
+        items = page.get("items") or []
+        size = _json_size(results)
+        self.requests += 1
+        self.n_bytes += size
+        if baseline:
+            # What the baseline's request (search_limit items) would have weighed
+            n_available = min(page.get("total", len(items)), self.search_limit)
+            envelope = size - sum(map(_json_size, items))
+            per_item = (size - envelope) / len(items) if items else 0
+            self.baseline_bytes += envelope + round(per_item * n_available)
+        return items
+
+
+def _is_confident(match: SongMatch, name: str, artist: Optional[str]) -> bool:
+    """Whether the match is an unambiguous exact (title, and artist) match."""
+    if match.not_found or match.ambiguous:
+        return False
+    if _normalize(match.track_name or "") != _normalize(name):
+        return False
+    if artist and _normalize(artist) not in map(_normalize, match.artist_names):
+        return False
+    return True
+
+
+def _resolve_song_adaptively(
+    descriptor: SongDescriptor,
+    name: str,
+    artist: Optional[str],
+    *,
+    market: Optional[str],
+    search_limit: int,
+    initial_limit: int,
+    ambiguous_score_gap: float,
+    client: Any,
+    stats: AdaptiveSearchStats,
+) -> SongMatch:
+    """Like ``_resolve_song``, but asking for few candidates first. See
+    :func:`resolve_song`."""
+    if artist:
+        queries = [f'track:"{name}" artist:"{artist}"', f"{name} {artist}".strip()]
+    else:
+        queries = [f'track:"{name}"', name]
+    initial_limit = min(initial_limit, search_limit)
+    search = _SizedSearch(market=market, search_limit=search_limit, client=client)
+
+    # Same fallback as _resolve_song: the plain query only if the qualified one fails
+    for query in queries:
+        candidates = search(query, initial_limit)
+        if candidates:
+            break
+
+    match, early_exit = None, False
+    # (fewer than initial_limit candidates means there are no more to get)
+    if len(candidates) == initial_limit < search_limit:
+        match = _match_from_candidates(
+            descriptor,
+            name,
+            artist,
+            candidates,
+            ambiguous_score_gap=ambiguous_score_gap,
+        )
+        early_exit = _is_confident(match, name, artist)
+        if not early_exit:
+            more = search(
+                query, search_limit - initial_limit, initial_limit, baseline=False
+            )
+            candidates, match = candidates + more, None
+
+    stats.record(
+        early_exit=early_exit,
+        requests=search.requests,
+        baseline_requests=queries.index(query) + 1,
+        n_bytes=search.n_bytes,
+        baseline_bytes=search.baseline_bytes,
+    )
+    if match is None:
+        match = _match_from_candidates(
+            descriptor,
+            name,
+            artist,
+            candidates,
+            ambiguous_score_gap=ambiguous_score_gap,
+        )
+    return match
 
 
 def resolve_song(
@@ -187,15 +524,110 @@ def resolve_song(
     search_limit: int = 10,
     ambiguous_score_gap: float = 10.0,
     client: Any = None,
+    memo: Union[ResolutionMemo, bool, None] = None,
+    adaptive: bool = False,
+    initial_limit: int = DFLT_ADAPTIVE_INITIAL_LIMIT,
+    stats: Optional[AdaptiveSearchStats] = None,
 ) -> SongMatch:
     """Resolve one song descriptor to a Spotify track via search + ranking.
 
     Returns a :class:`SongMatch` with the best candidate selected. The match
     is flagged ``ambiguous`` when the top two candidates score within
     ``ambiguous_score_gap`` of each other (callers may want to confirm).
+
+    With ``adaptive=True``, searches first ask for only ``initial_limit``
+    candidates, and ask for the rest (up to ``search_limit``) only if the best of
+    those isn't an unambiguous exact (title, and artist if given) match. The
+    requests made and bytes received, compared to the non-adaptive strategy, are
+    counted in ``stats`` (by default, the module's ``adaptive_search_stats``).
+
+    ``memo`` is a :class:`sung.caching.ResolutionMemo` to get the match from (and
+    keep it in), True for the default one, or False for none. By default (None),
+    the default memo is used if enabled (see
+    :func:`sung.caching.enable_resolution_memo`). Songs that aren't found aren't
+    memoized: they're searched for again next time (they may just have been
+    released, or the search may have failed transiently).
     """
     name, artist = parse_song_descriptor(descriptor)
+    memo = resolve_resolution_memo(memo)
+    if memo is not None:
+        key = memo.key(
+            name,
+            artist,
+            market,
+            search_limit,
+            ambiguous_score_gap,
+            initial_limit if adaptive else None,
+        )
+        stored = memo.get(key)  # (a new copy on each hit: nothing is shared)
+        if stored is not None:
+            return SongMatch(**dict(stored, descriptor=descriptor))
+    if adaptive:
+        match = _resolve_song_adaptively(
+            descriptor,
+            name,
+            artist,
+            market=market,
+            search_limit=search_limit,
+            initial_limit=initial_limit,
+            ambiguous_score_gap=ambiguous_score_gap,
+            client=client,
+            stats=stats if stats is not None else adaptive_search_stats,
+        )
+    else:
+        match = _resolve_song(
+            descriptor,
+            name,
+            artist,
+            market=market,
+            search_limit=search_limit,
+            ambiguous_score_gap=ambiguous_score_gap,
+            client=client,
+        )
+    if memo is not None and not match.not_found:
+        memo.set(key, asdict(match))
+    return match
 
+
+def forget_song(
+    descriptor: SongDescriptor,
+    *,
+    market: Optional[str] = None,
+    search_limit: int = 10,
+    ambiguous_score_gap: float = 10.0,
+    memo: Union[ResolutionMemo, bool, None] = None,
+    initial_limit: int = DFLT_ADAPTIVE_INITIAL_LIMIT,
+) -> None:
+    """Remove the memoized resolutions of a descriptor (see :func:`resolve_song`),
+    adaptive (with ``initial_limit``) or not, so that it's resolved again next
+    time."""
+    memo = resolve_resolution_memo(memo)
+    if memo is not None:
+        name, artist = parse_song_descriptor(descriptor)
+        for adaptive_initial_limit in (None, initial_limit):
+            memo.invalidate(
+                memo.key(
+                    name,
+                    artist,
+                    market,
+                    search_limit,
+                    ambiguous_score_gap,
+                    adaptive_initial_limit,
+                )
+            )
+
+
+def _resolve_song(
+    descriptor: SongDescriptor,
+    name: str,
+    artist: Optional[str],
+    *,
+    market: Optional[str],
+    search_limit: int,
+    ambiguous_score_gap: float,
+    client: Any,
+) -> SongMatch:
+    """Resolve the (parsed) descriptor, by searching. See :func:`resolve_song`."""
     # Use Spotify field-qualified search when we have an artist
     if artist:
         query = f'track:"{name}" artist:"{artist}"'
@@ -213,6 +645,23 @@ def resolve_song(
             query=plain, market=market, limit=search_limit, client=client
         )
 
+    return _match_from_candidates(
+        descriptor, name, artist, candidates, ambiguous_score_gap=ambiguous_score_gap
+    )
+
+
+def _match_from_candidates(
+    descriptor: SongDescriptor,
+    name: str,
+    artist: Optional[str],
+    candidates: Sequence[dict],
+    *,
+    ambiguous_score_gap: float = 10.0,
+    scorer: Optional[CandidateScorer] = None,
+) -> SongMatch:
+    """Rank candidate tracks for the (parsed) descriptor, making a :class:`SongMatch`
+    of the best one."""
+    scorer = scorer or default_scorer
     if not candidates:
         return SongMatch(
             descriptor=descriptor,
@@ -223,18 +672,14 @@ def resolve_song(
             not_found=True,
         )
 
-    scored = sorted(
-        ((c, _score_candidate(c, name, artist)) for c in candidates),
-        key=lambda x: x[1],
-        reverse=True,
-    )
+    scored = scorer.rank(candidates, name, artist)
     best, best_score = scored[0]
     runner_up = scored[1][0] if len(scored) > 1 else None
     runner_up_score = scored[1][1] if len(scored) > 1 else float("-inf")
     ambiguous = (
         runner_up is not None
         and (best_score - runner_up_score) < ambiguous_score_gap
-        and not _same_song(best, runner_up)
+        and not scorer.same_song(best, runner_up)
     )
 
     return SongMatch(
@@ -262,19 +707,278 @@ def resolve_song(
     )
 
 
+DFLT_RESOLVE_MAX_WORKERS = 8
+
+
 def resolve_songs(
     descriptors: Iterable[SongDescriptor],
     *,
     market: Optional[str] = None,
     search_limit: int = 10,
     client: Any = None,
+    max_workers: int = DFLT_RESOLVE_MAX_WORKERS,
+    on_match: Optional[Callable[[int, SongMatch], None]] = None,
+    memo: Union[ResolutionMemo, bool, None] = None,
+    adaptive: bool = False,
 ) -> list[SongMatch]:
-    """Resolve a list of descriptors. See :func:`resolve_song`."""
+    """Resolve a list of descriptors, concurrently. See :func:`resolve_song`.
+
+    Up to ``max_workers`` songs are resolved at a time, their searches going
+    through ``client`` (by default, the pooled client, so under the process-wide
+    rate limiting scheduler of :mod:`sung.throttle`). Descriptors of the same song
+    (same normalized name and artist) are only resolved once.
+
+    Returns the matches in the order of ``descriptors``. If given, ``on_match`` is
+    called with ``(index, match)`` as each song is resolved (in the calling thread,
+    in completion order), ``index`` being the position of its descriptor.
+    """
     client = ensure_client(client)
-    return [
-        resolve_song(d, market=market, search_limit=search_limit, client=client)
-        for d in descriptors
-    ]
+    descriptors = list(descriptors)
+    indices_of_key = {}
+    for index, descriptor in enumerate(descriptors):
+        key = ResolutionMemo.key(*parse_song_descriptor(descriptor))
+        indices_of_key.setdefault(key, []).append(index)
+
+    matches: list[Optional[SongMatch]] = [None] * len(descriptors)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        indices_of_future = {
+            executor.submit(
+                resolve_song,
+                descriptors[indices[0]],
+                market=market,
+                search_limit=search_limit,
+                client=client,
+                memo=memo,
+                adaptive=adaptive,
+            ): indices
+            for indices in indices_of_key.values()
+        }
+        try:
+            for future in as_completed(indices_of_future):
+                match = future.result()
+                for index in indices_of_future[future]:
+                    matches[index] = _match_copy(match, descriptors[index])
+                    if on_match is not None:
+                        on_match(index, matches[index])
+        finally:
+            for future in indices_of_future:
+                future.cancel()
+    return matches
+
+
+def _match_copy(match: SongMatch, descriptor: SongDescriptor) -> SongMatch:
+    """A copy of ``match`` for ``descriptor``, sharing no (mutable) lists with it."""
+    return replace(
+        match,
+        descriptor=descriptor,
+        artist_names=list(match.artist_names),
+        candidates=copy.deepcopy(match.candidates),
+    )
+
+
+DFLT_RESOLVE_CHUNK_SIZE = 64
+
+
+def iter_resolve_songs(
+    descriptors: Iterable[SongDescriptor],
+    *,
+    chunk_size: int = DFLT_RESOLVE_CHUNK_SIZE,
+    **resolve_kwargs,
+) -> Iterator[SongMatch]:
+    """Resolve descriptors as they come, yielding their matches in order.
+
+    ``descriptors`` is consumed lazily, ``chunk_size`` at a time (so it can be, say,
+    the lines of a huge file, or of stdin), each chunk being resolved concurrently
+    by :func:`resolve_songs` (which ``resolve_kwargs`` are passed to).
+    """
+    descriptors = iter(descriptors)
+    while chunk := list(islice(descriptors, chunk_size)):
+        yield from resolve_songs(chunk, **resolve_kwargs)
+
+
+# --------------------------------------------------------------------------------------
+# Local (offline-first) resolution
+
+
+def _tokens(text: Optional[str]) -> set:
+    """The normalized (see ``_normalize``) words of a text."""
+    return {token for token in map(_normalize, (text or "").split()) if token}
+
+
+DFLT_LOCAL_MAX_CANDIDATES = 50
+
+
+class LocalResolver:
+    """Resolves song descriptors against tracks we already have, before searching.
+
+    Track metadata (from :class:`sung.base.Tracks`, playlists, search results...) is
+    indexed by the normalized words of its title and artist names. A descriptor is
+    resolved locally by ranking (with the same scoring as :func:`resolve_song`) the
+    tracks sharing words with its title. Only if no local match is confident is
+    Spotify searched.
+
+    A local match is confident if it isn't ambiguous and scores at least
+    ``min_score`` (by default, 140 if the descriptor has an artist — e.g. exact
+    title and partial artist match — and 100 if not — e.g. exact title).
+
+    >>> resolver = LocalResolver([
+    ...     {'id': 'a', 'name': 'Fix You', 'artists': [{'name': 'Coldplay'}]},
+    ...     {'id': 'b', 'name': 'Clocks', 'artists': [{'name': 'Coldplay'}]},
+    ... ])
+    >>> resolver.resolve_local('fix you - coldplay').track_id
+    'a'
+    >>> resolver.resolve_local('Yellow - Coldplay') is None
+    True
+
+    Playlists (e.g. those of :func:`sung.base.load_playlists`) are indexed by their
+    tracks:
+
+    >>> from sung.base import PlaylistReader
+    >>> class StubClient:  # (standing in for a spotipy client)
+    ...     def playlist_items(self, playlist_id, **kwargs):
+    ...         track = {'id': 'c', 'name': 'Yellow', 'artists': [{'name': 'Coldplay'}]}
+    ...         return {'items': [{'track': track}], 'next': None}
+    >>> resolver.add(PlaylistReader('some_playlist_id', client=StubClient()))
+    >>> resolver.resolve_local('Yellow - Coldplay').track_id
+    'c'
+    """
+
+    def __init__(
+        self,
+        tracks: Iterable[dict] = (),
+        *,
+        min_score: Optional[float] = None,
+        ambiguous_score_gap: float = 10.0,
+        max_candidates: int = DFLT_LOCAL_MAX_CANDIDATES,
+        scorer: Optional[CandidateScorer] = None,
+    ):
+        self.min_score = min_score
+        self.scorer = scorer or default_scorer
+        self.ambiguous_score_gap = ambiguous_score_gap
+        self.max_candidates = max_candidates
+        self._track_metas: dict[str, dict] = {}
+        self._title_index: dict[str, set] = {}
+        self._artist_index: dict[str, set] = {}
+        self.add(tracks)
+
+    def add(self, tracks: Iterable[dict]) -> None:
+        """Index tracks: track metadata dicts, a :class:`sung.base.Tracks`, or a
+        playlist (:class:`sung.base.PlaylistReader` or ``Playlist``)."""
+        if isinstance(tracks, PlaylistReader):
+            # (a reader keeps its tracks in .tracks, not in its own track_metas)
+            tracks = tracks.tracks
+        track_metas = getattr(tracks, "track_metas", tracks)
+        for meta in track_metas:
+            if not meta or not meta.get("id") or meta["id"] in self._track_metas:
+                continue
+            track_id = meta["id"]
+            self._track_metas[track_id] = meta
+            for token in _tokens(meta.get("name")):
+                self._title_index.setdefault(token, set()).add(track_id)
+            for artist in meta.get("artists") or []:
+                for token in _tokens(artist.get("name")):
+                    self._artist_index.setdefault(token, set()).add(track_id)
+
+    def __len__(self) -> int:
+        return len(self._track_metas)
+
+    def candidates(self, name: str, artist: Optional[str] = None) -> list[dict]:
+        """The (at most ``max_candidates``) indexed tracks sharing the most words with
+        the title (and artist), ties going to the tracks whose titles are closest to
+        ``name`` (so that an exact title isn't cut off by many longer ones).
+
+        >>> resolver = LocalResolver(
+        ...     [{'id': str(i), 'name': f'Hello {i}'} for i in range(5)]
+        ...     + [{'id': 'h', 'name': 'Hello'}],
+        ...     max_candidates=2,
+        ... )
+        >>> candidates = resolver.candidates('hello')
+        >>> len(candidates), candidates[0]['name']
+        (2, 'Hello')
+        """
+        title_tokens = _tokens(name)
+        n_shared = {}
+        for token in title_tokens:
+            for track_id in self._title_index.get(token, ()):
+                n_shared[track_id] = n_shared.get(track_id, 0) + 1
+        for token in _tokens(artist):
+            for track_id in self._artist_index.get(token, ()):
+                if track_id in n_shared:  # (must share a title word)
+                    n_shared[track_id] += 1
+
+        def title_similarity(track_id: str) -> float:
+            # (the Jaccard similarity of the title words: 1 for an exact title)
+            tokens = _tokens(self._track_metas[track_id].get("name"))
+            return len(tokens & title_tokens) / len(tokens | title_tokens)
+
+        best = sorted(
+            n_shared, key=lambda t: (n_shared[t], title_similarity(t)), reverse=True
+        )
+        return [self._track_metas[t] for t in best[: self.max_candidates]]
+
+    def resolve_local(self, descriptor: SongDescriptor) -> Optional[SongMatch]:
+        """The confident local match for ``descriptor``, or None if there's none."""
+        name, artist = parse_song_descriptor(descriptor)
+        candidates = self.candidates(name, artist)
+        if not candidates:
+            return None
+        match = _match_from_candidates(
+            descriptor,
+            name,
+            artist,
+            candidates,
+            ambiguous_score_gap=self.ambiguous_score_gap,
+            scorer=self.scorer,
+        )
+        min_score = self.min_score
+        if min_score is None:
+            min_score = 140 if artist else 100
+        if match.ambiguous or match.score < min_score:
+            return None
+        return match
+
+    def resolve(self, descriptor: SongDescriptor, **resolve_song_kwargs) -> SongMatch:
+        """Resolve ``descriptor`` locally if possible, else with
+        :func:`resolve_song` (given ``resolve_song_kwargs``). Tracks found by
+        searching are indexed too."""
+        match = self.resolve_local(descriptor)
+        if match is None:
+            match = resolve_song(descriptor, **resolve_song_kwargs)
+            self._add_match(match)
+        return match
+
+    __call__ = resolve
+
+    def resolve_many(
+        self, descriptors: Iterable[SongDescriptor], **resolve_songs_kwargs
+    ) -> list[SongMatch]:
+        """Resolve descriptors locally if possible, and the others with
+        :func:`resolve_songs` (concurrently), returning matches in order."""
+        descriptors = list(descriptors)
+        matches = [self.resolve_local(d) for d in descriptors]
+        missing = [i for i, match in enumerate(matches) if match is None]
+        if missing:
+            resolved = resolve_songs(
+                [descriptors[i] for i in missing], **resolve_songs_kwargs
+            )
+            for i, match in zip(missing, resolved):
+                matches[i] = match
+                self._add_match(match)
+        return matches
+
+    def _add_match(self, match: SongMatch) -> None:
+        if match.track_id is not None:
+            self.add(
+                [
+                    {
+                        "id": match.track_id,
+                        "name": match.track_name,
+                        "artists": [{"name": a} for a in match.artist_names],
+                        "album": {"name": match.album_name},
+                        "popularity": match.popularity,
+                    }
+                ]
+            )
 
 
 def playlist_from_songs(
@@ -286,6 +990,8 @@ def playlist_from_songs(
     search_limit: int = 10,
     skip_missing: bool = True,
     client: Any = None,
+    memo: Union[ResolutionMemo, bool, None] = None,
+    adaptive: bool = False,
 ) -> tuple[Optional[Playlist], list[SongMatch]]:
     """Search for each song, then create a playlist with the resolved tracks.
 
@@ -298,7 +1004,12 @@ def playlist_from_songs(
     """
     descriptors = list(descriptors)
     matches = resolve_songs(
-        descriptors, market=market, search_limit=search_limit, client=client
+        descriptors,
+        market=market,
+        search_limit=search_limit,
+        client=client,
+        memo=memo,
+        adaptive=adaptive,
     )
 
     missing = [m for m in matches if m.not_found]
@@ -321,11 +1032,87 @@ def playlist_from_songs(
     return playlist, matches
 
 
+class SongListsPlaylists(NamedTuple):
+    """The result of :func:`playlists_from_song_lists` (each field keyed by
+    playlist name)."""
+
+    matches: dict[str, list[SongMatch]]
+    playlists: dict[str, Playlist]
+    errors: dict[str, Exception]
+
+
+def playlists_from_song_lists(
+    song_lists: Mapping[str, Iterable[SongDescriptor]],
+    *,
+    public: bool = True,
+    market: Optional[str] = None,
+    search_limit: int = 10,
+    client: Any = None,
+    memo: Union[ResolutionMemo, bool, None] = None,
+    adaptive: bool = False,
+    max_workers: int = DFLT_RESOLVE_MAX_WORKERS,
+    create: bool = True,
+    on_progress: Optional[Callable[[str, int, int], None]] = None,
+) -> SongListsPlaylists:
+    """Make many playlists from a ``{playlist_name: descriptors}`` mapping.
+
+    The songs of all lists are resolved together, by one :func:`resolve_songs` call
+    (so concurrently, and a song in many lists only once), and the playlists are
+    then created together, by :meth:`sung.base.Playlist.create_many` (lists with no
+    resolved song are skipped). With ``create=False``, songs are only resolved.
+
+    Returns the ``(matches, playlists, errors)`` of each list (see
+    :class:`sung.base.CreatedPlaylists` for ``playlists`` and ``errors``).
+    """
+    song_lists = {name: list(descriptors) for name, descriptors in song_lists.items()}
+    all_matches = iter(
+        resolve_songs(
+            [d for descriptors in song_lists.values() for d in descriptors],
+            market=market,
+            search_limit=search_limit,
+            client=client,
+            max_workers=max_workers,
+            memo=memo,
+            adaptive=adaptive,
+        )
+    )
+    matches = {
+        name: list(islice(all_matches, len(descriptors)))
+        for name, descriptors in song_lists.items()
+    }
+    track_lists = {
+        name: track_ids
+        for name, name_matches in matches.items()
+        if (track_ids := [m.track_id for m in name_matches if m.track_id])
+    }
+    if not create or not track_lists:
+        return SongListsPlaylists(matches, {}, {})
+    created = Playlist.create_many(
+        track_lists,
+        public,
+        client=client,
+        max_workers=max_workers,
+        on_progress=on_progress,
+    )
+    return SongListsPlaylists(matches, created.playlists, created.errors)
+
+
 # --------------------------------------------------------------------------------------
 # CLI
 #
 # Usage:
 #   python -m sung.playlists SONGS_FILE --name "My Mix" [--private] [--market US]
+#   python -m sung.playlists - --jsonl matches.jsonl [--resume] [--dry-run] < songs.txt
+#   python -m sung.playlists --batch SONGS_DIR_OR_MANIFEST [--report report.json]
+#
+# With --jsonl, songs are read (and resolved) as they come, and a JSON line is
+# written per song as soon as it's resolved; --resume skips the songs the output
+# already has, so an interrupted run can pick up where it stopped.
+#
+# With --batch, the source is a directory of song files (or a JSON manifest of
+# {playlist_name: songs_file_or_list}), and a playlist is made per song list, all
+# their songs being resolved together (each distinct song once); a combined JSON
+# report is written (see --report and --max-workers).
 #
 # SONGS_FILE: a text/markdown file with one song per non-empty, non-comment line.
 # Each line can be:
@@ -333,6 +1120,11 @@ def playlist_from_songs(
 #   - "Title - Artist" / "Title — Artist" / "Title by Artist"
 # Lines starting with "#" are treated as comments. Numbered list markers
 # ("1.", "1)", "- ", "* ") and surrounding markdown bold/italic are stripped.
+#
+# SONGS_FILE can also be a CSV, TSV or XLSX table (see sung.song_tables), whose
+# title and artist columns are found by name (or given with --name-column and
+# --artist-column). Its rows are read in chunks, and go to resolution as
+# {"name": ..., "artist": ...} descriptors.
 
 import re as _re
 
@@ -340,31 +1132,197 @@ _LIST_PREFIX_RE = _re.compile(r"^\s*(?:[-*]|\d+[.)])\s+")
 _MD_EMPHASIS_RE = _re.compile(r"\*+|_+")
 
 
-def _parse_songs_file(text: str) -> list[str]:
-    songs = []
-    for raw in text.splitlines():
+def _iter_songs_lines(lines: Iterable[str]) -> Iterator[str]:
+    for raw in lines:
         line = raw.strip()
         if not line or line.startswith("#"):
             continue
         line = _LIST_PREFIX_RE.sub("", line)
         line = _MD_EMPHASIS_RE.sub("", line).strip()
         if line:
-            songs.append(line)
-    return songs
+            yield line
+
+
+def _parse_songs_file(text: str) -> list[str]:
+    return list(_iter_songs_lines(text.splitlines()))
+
+
+def _iter_songs_source(
+    path: str, *, format: Optional[str] = None, **table_kwargs
+) -> Iterator[SongDescriptor]:
+    """The descriptors of a songs file (``'-'`` for stdin): lines of text, or the
+    rows of a table (see :func:`sung.song_tables.iter_song_table`, which
+    ``table_kwargs`` are passed to). The format is guessed from the extension if not
+    given. The file is read lazily."""
+    import io
+    import sys
+
+    if format is None:
+        format = (song_table_format(path) if path != "-" else None) or "text"
+    if format == "text":
+        if path == "-":
+            yield from _iter_songs_lines(sys.stdin)
+        else:
+            with open(path, "r", encoding="utf-8") as fh:
+                yield from _iter_songs_lines(fh)
+        return
+    if path == "-":
+        if format == "xlsx":  # (workbooks need to be seekable)
+            path = io.BytesIO(sys.stdin.buffer.read())
+        else:
+            path = sys.stdin
+    yield from iter_song_table(path, format=format, **table_kwargs)
+
+
+def _add_songs_file_arguments(parser) -> None:
+    parser.add_argument(
+        "--format",
+        choices=["text", "csv", "tsv", "xlsx"],
+        default=None,
+        help="The format of the songs file(s) (by default, according to their "
+        "extension, text if they have no table extension).",
+    )
+    parser.add_argument(
+        "--name-column",
+        default=None,
+        help="The column of the song titles, in tables (by default, the first "
+        "column called name, title, song, ...).",
+    )
+    parser.add_argument(
+        "--artist-column",
+        default=None,
+        help="The column of the artists, in tables (by default, the first column "
+        "called artist, first_artist, ...).",
+    )
+    parser.add_argument(
+        "--sheet", default=None, help="The sheet to read, in XLSX workbooks."
+    )
+
+
+def _songs_file_kwargs(args) -> dict:
+    return dict(
+        format=args.format,
+        name_column=args.name_column,
+        artist_column=args.artist_column,
+        sheet=args.sheet,
+    )
+
+
+def _match_record(match: SongMatch) -> dict:
+    """The JSON-able report of a match (as in the CLI's JSON and JSONL outputs)."""
+    return {
+        "descriptor": match.descriptor,
+        "query_name": match.query_name,
+        "query_artist": match.query_artist,
+        "track_id": match.track_id,
+        "track_name": match.track_name,
+        "artist_names": match.artist_names,
+        "album_name": match.album_name,
+        "popularity": match.popularity,
+        "ambiguous": match.ambiguous,
+        "not_found": match.not_found,
+    }
+
+
+def _descriptor_key(descriptor) -> str:
+    # (so that a tuple descriptor and the list it is read back as are the same)
+    return json.dumps(descriptor, sort_keys=True, ensure_ascii=False)
+
+
+def _read_jsonl_records(path: str) -> dict[str, dict]:
+    """The records of a JSONL output (of a previous run), keyed by descriptor.
+
+    A last line cut short (by a crash) is ignored.
+    """
+    records = {}
+    try:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records[_descriptor_key(record["descriptor"])] = record
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def _drop_partial_last_line(path: str) -> None:
+    """Truncate a file to its last complete line (e.g. one a crash cut short), so
+    that it can be appended to."""
+    try:
+        with open(path, "rb+") as fh:
+            size = end = fh.seek(0, os.SEEK_END)
+            while end > 0:
+                start = max(end - 4096, 0)
+                fh.seek(start)
+                newline = fh.read(end - start).rfind(b"\n")
+                if newline != -1:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end != size:
+                fh.truncate(end)
+    except FileNotFoundError:
+        pass
+
+
+def _resolve_to_jsonl(
+    descriptors: Iterable[SongDescriptor],
+    out,
+    *,
+    done: dict[str, dict],
+    chunk_size: int = DFLT_RESOLVE_CHUNK_SIZE,
+    **resolve_kwargs,
+) -> list[Optional[str]]:
+    """Resolve the descriptors that aren't ``done``, writing (and flushing) a JSONL
+    record per match to ``out`` as soon as it's resolved (in completion order, so
+    that a run killed midway loses at most the songs being resolved). Returns the
+    track ids of all ``descriptors`` (done or not), in order."""
+    keys = []
+    out_lock = threading.Lock()
+
+    def pending():
+        for descriptor in descriptors:
+            key = _descriptor_key(descriptor)
+            keys.append(key)
+            if key not in done:
+                done[key] = None  # (resolve duplicates only once)
+                yield descriptor
+
+    def write(index: int, match: SongMatch) -> None:
+        record = _match_record(match)
+        with out_lock:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            done[_descriptor_key(match.descriptor)] = record
+
+    descriptors_to_resolve = pending()
+    while chunk := list(islice(descriptors_to_resolve, chunk_size)):
+        resolve_songs(chunk, on_match=write, **resolve_kwargs)
+    return [(done[key] or {}).get("track_id") for key in keys]
 
 
 def _cli(argv=None):
     import argparse
-    import json
     import sys
 
     parser = argparse.ArgumentParser(
-        description="Create a Spotify playlist from a list of song names."
+        description="Create a Spotify playlist from a list of song names (or, with "
+        "--batch, many playlists, one per song list)."
     )
     parser.add_argument(
         "songs_file",
-        help="Path to a text/markdown file with one song per line "
-        "(use '-' to read from stdin).",
+        help="Path to a text/markdown file with one song per line, or to a CSV, "
+        "TSV or XLSX table of songs (use '-' to read from stdin). With --batch, a "
+        "directory of song files (one playlist per file, named after it), or a JSON "
+        "manifest mapping playlist names to song files or lists of songs.",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Make a playlist per song list of the songs_file directory or manifest.",
     )
     parser.add_argument("--name", "-n", default="New Playlist", help="Playlist name.")
     parser.add_argument(
@@ -376,53 +1334,86 @@ def _cli(argv=None):
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="Resolve songs and print matches, but do not create the playlist.",
+        help="Resolve songs and print matches, but do not create the playlist(s).",
     )
     parser.add_argument(
         "--json", action="store_true", help="Emit the match report as JSON."
     )
+    parser.add_argument(
+        "--jsonl",
+        metavar="OUTPUT",
+        default=None,
+        help="Write a JSON line per song to OUTPUT ('-' for stdout) as soon as it's "
+        "resolved, reading the songs as they come.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="With --jsonl OUTPUT, skip the songs OUTPUT already has (appending "
+        "the others to it).",
+    )
+    parser.add_argument(
+        "--no-memo",
+        action="store_true",
+        help="Resolve all songs afresh, instead of reusing (and remembering) "
+        "resolutions from previous runs.",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Ask for a few candidates per song first, and for more only when "
+        "those don't include a clear match (reporting the savings on stderr).",
+    )
+    parser.add_argument(
+        "--report",
+        default="-",
+        help="With --batch, where to write the (JSON) report of all playlists ('-', "
+        "the default, for stdout).",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=DFLT_RESOLVE_MAX_WORKERS,
+        help="With --batch, how many songs to resolve, and playlists to create, at "
+        "a time.",
+    )
+    _add_songs_file_arguments(parser)
     args = parser.parse_args(argv)
+    if args.batch:
+        if args.json or args.jsonl is not None or args.resume:
+            parser.error("--batch doesn't go with --json, --jsonl or --resume.")
+        return _cli_batch(parser, args)
+    if args.resume and args.jsonl in (None, "-"):
+        parser.error("--resume needs a --jsonl output file.")
+    resolve_kwargs = dict(
+        market=args.market, memo=not args.no_memo, adaptive=args.adaptive
+    )
 
-    if args.songs_file == "-":
-        text = sys.stdin.read()
-    else:
-        with open(args.songs_file, "r", encoding="utf-8") as fh:
-            text = fh.read()
-
-    descriptors = _parse_songs_file(text)
+    descriptors = _iter_songs_source(args.songs_file, **_songs_file_kwargs(args))
+    if args.jsonl is not None:
+        return _cli_jsonl(args, descriptors, resolve_kwargs)
+    descriptors = list(descriptors)
     if not descriptors:
         parser.error("No songs found in input.")
 
     if args.dry_run:
-        matches = resolve_songs(descriptors, market=args.market)
+        matches = resolve_songs(descriptors, **resolve_kwargs)
         playlist = None
     else:
         playlist, matches = playlist_from_songs(
             descriptors,
             playlist_name=args.name,
             public=not args.private,
-            market=args.market,
+            **resolve_kwargs,
         )
+    if args.adaptive:
+        print(f"Adaptive search: {adaptive_search_stats.report()}", file=sys.stderr)
 
     if args.json:
         report = {
             "playlist_url": playlist.playlist_url if playlist else None,
             "playlist_id": playlist.playlist_id if playlist else None,
-            "matches": [
-                {
-                    "descriptor": m.descriptor,
-                    "query_name": m.query_name,
-                    "query_artist": m.query_artist,
-                    "track_id": m.track_id,
-                    "track_name": m.track_name,
-                    "artist_names": m.artist_names,
-                    "album_name": m.album_name,
-                    "popularity": m.popularity,
-                    "ambiguous": m.ambiguous,
-                    "not_found": m.not_found,
-                }
-                for m in matches
-            ],
+            "matches": list(map(_match_record, matches)),
         }
         print(json.dumps(report, indent=2, ensure_ascii=False))
         return
@@ -439,5 +1430,141 @@ def _cli(argv=None):
         print(f"{i:>3}  {desc:<40}  {m.summary()}")
 
 
+def _cli_jsonl(args, descriptors: Iterable[SongDescriptor], resolve_kwargs: dict):
+    """The streaming (``--jsonl``) mode of the CLI: matches are written as they're
+    resolved, and the playlist (if any) is made once they all are. Messages go to
+    stderr, so that the JSONL can go to stdout."""
+    import sys
+
+    done = {}
+    if args.resume:
+        _drop_partial_last_line(args.jsonl)
+        done = _read_jsonl_records(args.jsonl)
+    if done:
+        print(f"Resuming: {len(done)} songs already resolved.", file=sys.stderr)
+    if args.jsonl == "-":
+        out = sys.stdout
+    else:
+        out = open(args.jsonl, "a" if args.resume else "w", encoding="utf-8")
+    try:
+        track_ids = _resolve_to_jsonl(descriptors, out, done=done, **resolve_kwargs)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if args.adaptive:
+        print(f"Adaptive search: {adaptive_search_stats.report()}", file=sys.stderr)
+
+    n_songs, track_ids = len(track_ids), [t for t in track_ids if t]
+    print(f"{len(track_ids)} of {n_songs} songs resolved.", file=sys.stderr)
+    if args.dry_run or not track_ids:
+        return
+    playlist = Playlist.create_from_track_list(
+        track_list=track_ids, playlist_name=args.name, public=not args.private
+    )
+    print(f"Playlist created: {playlist.playlist_url}", file=sys.stderr)
+
+
+SONG_LIST_SUFFIXES = (".txt", ".md")
+
+
+def _is_songs_file(filename: str) -> bool:
+    if filename.startswith("."):
+        return False
+    return filename.endswith(SONG_LIST_SUFFIXES) or bool(song_table_format(filename))
+
+
+def _song_lists_from_source(
+    source: str, **songs_file_kwargs
+) -> dict[str, list[SongDescriptor]]:
+    """The ``{playlist_name: descriptors}`` of a batch source: either a directory of
+    song files (one playlist per file, named after it), or a JSON manifest mapping
+    playlist names to song files (relative to the manifest) or to lists of songs.
+    Song files are read by ``_iter_songs_source(path, **songs_file_kwargs)``."""
+
+    def read(path):
+        return list(_iter_songs_source(path, **songs_file_kwargs))
+
+    if os.path.isdir(source):
+        return {
+            os.path.splitext(filename)[0]: read(os.path.join(source, filename))
+            for filename in sorted(os.listdir(source))
+            if _is_songs_file(filename)
+        }
+    with open(source, "r", encoding="utf-8") as fh:
+        manifest = json.load(fh)
+    if not isinstance(manifest, dict):
+        raise ValueError(
+            f"A manifest should map playlist names to song files or lists: {source}"
+        )
+    rootdir = os.path.dirname(os.path.abspath(source))
+    return {
+        name: (
+            read(os.path.join(rootdir, songs))
+            if isinstance(songs, str)
+            else list(songs)
+        )
+        for name, songs in manifest.items()
+    }
+
+
+def _cli_batch(parser, args):
+    """The ``--batch`` mode of the CLI: a playlist per song list of a directory or
+    manifest, with a combined JSON report."""
+    import sys
+
+    song_lists = _song_lists_from_source(args.songs_file, **_songs_file_kwargs(args))
+    song_lists = {name: songs for name, songs in song_lists.items() if songs}
+    if not song_lists:
+        parser.error(f"No songs found in {args.songs_file}.")
+    n_songs = sum(map(len, song_lists.values()))
+    print(
+        f"Resolving {n_songs} songs for {len(song_lists)} playlists...",
+        file=sys.stderr,
+    )
+    result = playlists_from_song_lists(
+        song_lists,
+        public=not args.private,
+        market=args.market,
+        memo=not args.no_memo,
+        adaptive=args.adaptive,
+        max_workers=args.max_workers,
+        create=not args.dry_run,
+    )
+    if args.adaptive:
+        print(f"Adaptive search: {adaptive_search_stats.report()}", file=sys.stderr)
+
+    report = {}
+    for name, matches in result.matches.items():
+        playlist = result.playlists.get(name)
+        error = result.errors.get(name)
+        report[name] = {
+            "playlist_id": (
+                playlist.playlist_id
+                if playlist
+                else getattr(error, "playlist_id", None)
+            ),
+            "playlist_url": playlist.playlist_url if playlist else None,
+            "error": repr(error) if error else None,
+            "n_songs": len(matches),
+            "n_resolved": sum(1 for m in matches if m.track_id),
+            "matches": list(map(_match_record, matches)),
+        }
+    report_json = json.dumps({"playlists": report}, indent=2, ensure_ascii=False)
+    if args.report == "-":
+        print(report_json)
+    else:
+        with open(args.report, "w", encoding="utf-8") as fh:
+            fh.write(report_json + "\n")
+
+    n_resolved = sum(r["n_resolved"] for r in report.values())
+    print(
+        f"{n_resolved} of {n_songs} songs resolved; {len(result.playlists)} "
+        f"playlists created, {len(result.errors)} failed.",
+        file=sys.stderr,
+    )
+    if result.errors:
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
     _cli()
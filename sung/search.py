@@ -0,0 +1,372 @@
+"""Search beyond single pages of results.
+
+`sung.base.search_tracks` gets one page of (at most 50) results. `iter_search`
+iterates over all the results of a search, up to the API's limit (it won't go past
+the 1000th result), getting the next page in the background while the current one is
+being consumed, and stopping as soon as the caller stops iterating.
+
+`search_many` runs many searches concurrently (sending duplicate searches only once),
+returning results in the order of the queries, and `iter_search_many` streams them
+as they complete.
+
+`search_multi` gets several types of items (e.g. tracks, artists and albums) with a
+single request, each type decoded into its own section of typed objects.
+
+>>> from sung.search import iter_search  # doctest: +SKIP
+>>> from itertools import islice  # doctest: +SKIP
+>>> names = [t['name'] for t in iter_search('love', max_results=120)]  # doctest: +SKIP
+>>> len(names)  # doctest: +SKIP
+120
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from collections.abc import Iterator, Iterable, Callable, Mapping, Sequence
+from typing import Any
+
+from sung.util import ensure_client, extractor, SearchTypeT, DFLT_LIMIT
+from sung.base import search_query_string, _cached_search
+from sung.caching import SearchCache
+
+MAX_SEARCH_PAGE_SIZE = 50
+MAX_SEARCH_RESULTS = 1000  # the API refuses offset + limit > 1000
+
+
+def iter_search(
+    query: str,
+    *,
+    search_type: SearchTypeT = "track",
+    max_results: int | None = None,
+    market=None,
+    year=None,
+    genre=None,
+    page_size: int = MAX_SEARCH_PAGE_SIZE,
+    prefetch: bool = True,
+    client=None,
+    cache: SearchCache | bool | None = None,
+) -> Iterator[dict]:
+    """Iterate over the results (items) of a search, page by page.
+
+    Parameters:
+        - query: The search query.
+        - search_type: The (one) type of items to search for.
+        - max_results: How many items to yield, at most (and at most 1000, the
+          API's limit).
+        - market, year, genre: As in `sung.base.search_tracks`.
+        - page_size: How many items to get per request (at most 50).
+        - prefetch: Whether to request the next page (in a background thread) while
+          the items of the current one are being consumed.
+        - cache: As in `sung.base.search_tracks`.
+
+    Pages are only requested as needed: if the caller stops iterating, no more
+    requests are made (besides, with ``prefetch``, the one already in flight).
+    """
+    client = ensure_client(client)
+    query_string = search_query_string(query, year=year, genre=genre)
+    section = f"{search_type}s"
+    page_size = min(page_size, MAX_SEARCH_PAGE_SIZE)
+    if max_results is None:
+        max_results = MAX_SEARCH_RESULTS
+    max_results = min(max_results, MAX_SEARCH_RESULTS)
+
+    def get_page(offset):
+        limit = min(page_size, max_results - offset)
+        results = _cached_search(
+            client,
+            query_string,
+            search_type,
+            market=market,
+            limit=limit,
+            offset=offset,
+            cache=cache,
+        )
+        return results.get(section) or {}
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        offsets = iter(range(0, max_results, page_size))
+        offset = next(offsets, None)
+        next_page = None
+        while offset is not None:
+            if next_page is not None:
+                page = next_page.result()
+            else:
+                page = get_page(offset)
+            items = page.get("items") or []
+            total = page.get("total", max_results)
+            offset = next(offsets, None)
+            has_more = (
+                offset is not None
+                and offset < total
+                and page.get("next") is not None
+                and len(items) > 0
+            )
+            next_page = None
+            if has_more and executor is not None:
+                next_page = executor.submit(get_page, offset)
+            for item in items:
+                yield item
+            if not has_more:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+DFLT_SEARCH_MAX_WORKERS = 8
+
+
+def iter_search_many(
+    queries: Iterable[str],
+    egress: Callable = extractor("tracks.items"),
+    *,
+    search_type: SearchTypeT = "track",
+    market=None,
+    year=None,
+    genre=None,
+    limit: int = DFLT_LIMIT,
+    offset: int = 0,
+    max_workers: int = DFLT_SEARCH_MAX_WORKERS,
+    return_exceptions: bool = False,
+    client=None,
+    cache: SearchCache | bool | None = None,
+) -> Iterator[tuple[int, Any]]:
+    """Run many searches concurrently, yielding ``(index, result)`` pairs as they
+    complete, ``index`` being the position of the query in ``queries``.
+
+    Queries that normalize to the same search (see `sung.caching.SearchCache.key`)
+    are only sent once: their indices are all yielded when it completes.
+    With ``return_exceptions=True``, failed searches yield their exception (instead
+    of raising it). Other arguments are as in `sung.base.search_tracks`.
+
+    The searches go through ``client`` (by default, the pooled client of
+    `sung.clients`, so under the process-wide rate limiting scheduler).
+    """
+    client = ensure_client(client)
+    indices_of_key = {}
+    query_string_of_key = {}
+    for index, query in enumerate(queries):
+        query_string = search_query_string(query, year=year, genre=genre)
+        key = SearchCache.key(query_string, search_type, market, limit, offset)
+        indices_of_key.setdefault(key, []).append(index)
+        query_string_of_key.setdefault(key, query_string)
+
+    def search(query_string):
+        results = _cached_search(
+            client,
+            query_string,
+            search_type,
+            market=market,
+            limit=limit,
+            offset=offset,
+            cache=cache,
+        )
+        return egress(results)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        key_of_future = {
+            executor.submit(search, query_string): key
+            for key, query_string in query_string_of_key.items()
+        }
+        try:
+            for future in as_completed(key_of_future):
+                try:
+                    result = future.result()
+                except Exception as error:
+                    if not return_exceptions:
+                        raise
+                    result = error
+                for index in indices_of_key[key_of_future[future]]:
+                    yield index, result
+        finally:
+            for future in key_of_future:
+                future.cancel()
+
+
+def search_many(
+    queries: Iterable[str],
+    egress: Callable = extractor("tracks.items"),
+    **kwargs,
+) -> list:
+    """Run many searches concurrently, returning their results in the order of
+    ``queries``.
+
+    Takes the same arguments as `iter_search_many` (which streams the results as
+    they complete).
+
+    >>> from sung.search import search_many  # doctest: +SKIP
+    >>> results = search_many(['Yesterday', 'Let it be', 'yesterday'])  # doctest: +SKIP
+    >>> results[0] is results[2]  # (only two searches were made)  # doctest: +SKIP
+    True
+    """
+    queries = list(queries)
+    results = [None] * len(queries)
+    for index, result in iter_search_many(queries, egress, **kwargs):
+        results[index] = result
+    return results
+
+
+# --------------------------------------------------------------------------------------
+# Multi-type search
+
+# The (pydantic_models) model of the items of each type of search result
+_MODEL_NAME_OF_TYPE = {
+    "track": "TrackObject",
+    "artist": "ArtistObject",
+    "album": "SimplifiedAlbumObject",
+    "playlist": "SimplifiedPlaylistObject",
+    "show": "SimplifiedShowObject",
+    "episode": "SimplifiedEpisodeObject",
+}
+DFLT_MULTI_SEARCH_TYPES = ("track", "artist", "album")
+
+
+def _item_model(search_type: str):
+    from sung import pydantic_models  # a big module: only imported when needed
+
+    return getattr(pydantic_models, _MODEL_NAME_OF_TYPE[search_type])
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model, field_name: str):
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(model.model_fields[field_name].annotation)
+
+
+def _to_model(model, data: dict):
+    """Make a ``model`` instance from ``data``, leniently.
+
+    If ``data`` doesn't validate as a whole (the API doesn't always match its spec),
+    each field is validated on its own, and those that don't validate are kept raw.
+    """
+    from pydantic import ValidationError
+
+    try:
+        return model.model_validate(data)
+    except ValidationError:
+        pass
+    values = {}
+    for name, value in data.items():
+        if name in model.model_fields:
+            try:
+                value = _field_adapter(model, name).validate_python(value)
+            except ValidationError:
+                pass
+        values[name] = value
+    return model.model_construct(**values)
+
+
+class SearchSection(Sequence):
+    """The items of one type of a search response, as (pydantic) typed objects.
+
+    Items are only turned into typed objects when accessed (and then kept). The raw
+    dicts are in ``raw_items``. Fields that don't validate against their model
+    (the API doesn't always match its spec) are kept raw (see `_to_model`).
+    """
+
+    def __init__(self, search_type: str, paging: dict):
+        self.search_type = search_type
+        self.paging = paging
+        # Some sections (e.g. playlists) can have null items
+        self.raw_items = [item for item in paging.get("items") or [] if item]
+        self._objects = [None] * len(self.raw_items)
+
+    @property
+    def total(self) -> int:
+        """The total number of results of this type (not just in this page)."""
+        return self.paging.get("total", len(self.raw_items))
+
+    def _object(self, index: int):
+        obj = self._objects[index]
+        if obj is None:
+            obj = _to_model(_item_model(self.search_type), self.raw_items[index])
+            self._objects[index] = obj
+        return obj
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._object(i) for i in range(*index.indices(len(self)))]
+        return self._object(range(len(self))[index])
+
+    def __len__(self) -> int:
+        return len(self.raw_items)
+
+    def __repr__(self) -> str:
+        return f"<SearchSection {self.search_type}s: {len(self)} of {self.total}>"
+
+
+class SearchResults(Mapping):
+    """The sections of a multi-type search response, keyed by (plural) type
+    (``'tracks'``, ``'artists'``, ...), each made into a `SearchSection` when first
+    accessed. The raw response is in ``raw``."""
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+        self._sections = {}
+
+    def __getitem__(self, key: str) -> SearchSection:
+        if key not in self._sections:
+            if key not in self.raw:
+                raise KeyError(key)
+            self._sections[key] = SearchSection(key[:-1], self.raw[key])
+        return self._sections[key]
+
+    def __iter__(self):
+        return iter(self.raw)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __getattr__(self, name):
+        # So that results.tracks, results.artists, ... work too
+        if name.startswith("_") or name not in self.__dict__.get("raw", {}):
+            raise AttributeError(name)
+        return self[name]
+
+    def __repr__(self) -> str:
+        sections = ", ".join(f"{key}={len(self[key])}" for key in self)
+        return f"<SearchResults {sections}>"
+
+
+def search_multi(
+    query: str,
+    search_types: Iterable[SearchTypeT] = DFLT_MULTI_SEARCH_TYPES,
+    *,
+    market=None,
+    year=None,
+    genre=None,
+    limit: int = DFLT_LIMIT,
+    offset: int = 0,
+    client=None,
+    cache: SearchCache | bool | None = None,
+) -> SearchResults:
+    """Search for several types of items (by default, tracks, artists and albums)
+    with a single request.
+
+    Returns a `SearchResults` mapping each (plural) type to its `SearchSection`,
+    whose items are typed (pydantic) objects, made only when accessed.
+    ``limit`` and ``offset`` apply to each type.
+
+    >>> from sung.search import search_multi  # doctest: +SKIP
+    >>> results = search_multi('Abbey Road')  # doctest: +SKIP
+    >>> results.albums[0].name  # doctest: +SKIP
+    'Abbey Road (Remastered)'
+    >>> results['artists'][0].name  # doctest: +SKIP
+    'The Beatles'
+    """
+    client = ensure_client(client)
+    search_types = list(search_types)
+    if unknown := set(search_types) - set(_MODEL_NAME_OF_TYPE):
+        raise ValueError(f"Unknown search types: {sorted(unknown)}")
+    results = _cached_search(
+        client,
+        search_query_string(query, year=year, genre=genre),
+        ",".join(search_types),
+        market=market,
+        limit=limit,
+        offset=offset,
+        cache=cache,
+    )
+    return SearchResults(results)
@@ -0,0 +1,214 @@
+"""Read song descriptors from tables (CSV, TSV and XLSX files).
+
+Curators' song lists often come as spreadsheets, with the title and the artist in
+their own columns (e.g. ``misc/encore_playlist.tsv``). `iter_song_table` reads such a
+table and yields ``{'name': ..., 'artist': ...}`` descriptors, which
+`sung.playlists.resolve_song` takes as they are (no guessing where the title ends
+and the artist starts).
+
+Rows are read in chunks (CSV and TSV with pandas, XLSX with ``openpyxl``, in
+read-only mode, which ``pip install sung[xlsx]`` installs), and only the title and
+artist columns are parsed, so even huge tables are never loaded whole.
+
+>>> import io
+>>> table = io.StringIO("Title,Artist,Year\\nClocks,Coldplay,2002\\nYesterday,,1965\\n")
+>>> list(iter_song_table(table, format="csv"))
+[{'name': 'Clocks', 'artist': 'Coldplay'}, {'name': 'Yesterday'}]
+
+"""
+
+import os
+from collections.abc import Iterable, Iterator
+from typing import Optional
+
+# The separators of the delimited formats, and the formats of file extensions
+_SEPARATOR_OF_FORMAT = {"csv": ",", "tsv": "\t"}
+SONG_TABLE_FORMATS = {".csv": "csv", ".tsv": "tsv", ".tab": "tsv", ".xlsx": "xlsx"}
+
+# The columns looked for (case insensitively, in this order) when not given
+DFLT_NAME_COLUMNS = ("name", "title", "song", "track", "track_name", "song_name")
+DFLT_ARTIST_COLUMNS = ("artist", "first_artist", "artist_name", "singer", "artists")
+DFLT_CHUNKSIZE = 10_000  # rows
+
+
+def song_table_format(path: str) -> Optional[str]:
+    """The format (``'csv'``, ``'tsv'`` or ``'xlsx'``) of a table file, according
+    to its extension, or None if it's not one.
+
+    >>> song_table_format('misc/encore_playlist.TSV')
+    'tsv'
+    >>> song_table_format('songs.txt') is None
+    True
+    """
+    return SONG_TABLE_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def _find_column(
+    header: list, column: Optional[str], candidates: Iterable[str], what: str
+) -> Optional[int]:
+    """The index of ``column`` in ``header`` (or, if not given, of the first of
+    ``candidates`` there is), ignoring case, or None if there's none.
+
+    >>> _find_column(['Title', 'Artist'], 'title', DFLT_NAME_COLUMNS, 'name')
+    0
+    >>> _find_column(['Title', 'Artist'], None, DFLT_ARTIST_COLUMNS, 'artist')
+    1
+    """
+    names = [str(name).strip() if name is not None else "" for name in header]
+    lowered = [name.lower() for name in names]
+    if column is not None:
+        if column.strip().lower() in lowered:
+            return lowered.index(column.strip().lower())
+        raise ValueError(f"No {what} column {column!r} in the table: {names}")
+    for candidate in candidates:
+        if candidate in lowered:
+            return lowered.index(candidate)
+    return None
+
+
+def _descriptor(name, artist) -> Optional[dict]:
+    name = str(name).strip() if name is not None else ""
+    if not name:
+        return None
+    artist = str(artist).strip() if artist is not None else ""
+    return {"name": name, "artist": artist} if artist else {"name": name}
+
+
+def _is_seekable(stream) -> bool:
+    try:
+        return stream.seekable()
+    except (AttributeError, ValueError):
+        return False
+
+
+def _iter_delimited_rows(
+    source, sep: str, name_column, artist_column, chunksize: int
+) -> Iterator[tuple]:
+    import pandas as pd
+
+    # Only parse the columns that could be the name or artist ones (deciding which
+    # they are from the first chunk, so that source can be a stream, like stdin)
+    wanted = {
+        *((name_column,) if name_column is not None else DFLT_NAME_COLUMNS),
+        *((artist_column,) if artist_column is not None else DFLT_ARTIST_COLUMNS),
+    }
+    wanted = {column.lower() for column in wanted}
+
+    def is_wanted(column: str) -> bool:
+        return column.strip().lower() in wanted
+
+    # Where the table starts, to read its whole header again for error messages
+    is_path = isinstance(source, (str, os.PathLike))
+    start = source.tell() if not is_path and _is_seekable(source) else None
+
+    def full_header(parsed_header: list) -> list:
+        if is_path or start is not None:
+            if start is not None:
+                source.seek(start)
+            return list(pd.read_csv(source, sep=sep, nrows=0).columns)
+        return parsed_header  # (a stream, like stdin, can't be read again)
+
+    chunks = pd.read_csv(
+        source,
+        sep=sep,
+        usecols=is_wanted,
+        dtype=str,
+        keep_default_na=False,
+        chunksize=chunksize,
+    )
+    name_label = artist_label = None
+    for chunk in chunks:
+        if name_label is None:
+            header = list(chunk.columns)
+            try:
+                name_index = _find_column(
+                    header, name_column, DFLT_NAME_COLUMNS, "name"
+                )
+                artist_index = _find_column(
+                    header, artist_column, DFLT_ARTIST_COLUMNS, "artist"
+                )
+            except ValueError:
+                # (only the wanted columns were parsed: report the table's header)
+                table_header = full_header(header)
+                _find_column(table_header, name_column, (), "name")
+                _find_column(table_header, artist_column, (), "artist")
+                raise
+            if name_index is None:
+                raise ValueError(
+                    "Couldn't tell which column has the song names: "
+                    f"{full_header(header)}"
+                )
+            name_label = header[name_index]
+            if artist_index is not None:
+                artist_label = header[artist_index]
+        if artist_label is None:
+            yield from ((name, None) for name in chunk[name_label])
+        else:
+            yield from zip(chunk[name_label], chunk[artist_label])
+
+
+def _iter_xlsx_rows(
+    source, sheet: Optional[str], name_column, artist_column
+) -> Iterator[tuple]:
+    import openpyxl  # pip install openpyxl
+
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet is not None else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        name_index = _find_column(header, name_column, DFLT_NAME_COLUMNS, "name")
+        if name_index is None:
+            raise ValueError(f"Couldn't tell which column has the song names: {header}")
+        artist_index = _find_column(
+            header, artist_column, DFLT_ARTIST_COLUMNS, "artist"
+        )
+        for row in rows:
+            name = row[name_index] if name_index < len(row) else None
+            artist = None
+            if artist_index is not None and artist_index < len(row):
+                artist = row[artist_index]
+            yield name, artist
+    finally:
+        workbook.close()
+
+
+def iter_song_table(
+    source,
+    *,
+    format: Optional[str] = None,
+    name_column: Optional[str] = None,
+    artist_column: Optional[str] = None,
+    sheet: Optional[str] = None,
+    chunksize: int = DFLT_CHUNKSIZE,
+) -> Iterator[dict]:
+    """Iterate over the ``{'name': ..., 'artist': ...}`` song descriptors of a table.
+
+    Parameters:
+        - source: The path of the table file (or, for CSV and TSV, a file object).
+        - format: ``'csv'``, ``'tsv'`` or ``'xlsx'`` (by default, according to the
+          extension of ``source``).
+        - name_column, artist_column: The (header) names of the columns holding the
+          song titles and artists (case doesn't matter). By default, the first of
+          ``DFLT_NAME_COLUMNS`` (and ``DFLT_ARTIST_COLUMNS``) the table has. A table
+          without an artist column gives descriptors with just a name.
+        - sheet: The sheet of an XLSX workbook (by default, the active one).
+        - chunksize: How many rows of CSV and TSV tables to read at a time.
+
+    Rows without a name are skipped.
+    """
+    if format is None:
+        if not isinstance(source, (str, os.PathLike)):
+            raise ValueError("Specify the format of a table given as a file object")
+        format = song_table_format(os.fspath(source))
+    if format in _SEPARATOR_OF_FORMAT:
+        rows = _iter_delimited_rows(
+            source, _SEPARATOR_OF_FORMAT[format], name_column, artist_column, chunksize
+        )
+    elif format == "xlsx":
+        rows = _iter_xlsx_rows(source, sheet, name_column, artist_column)
+    else:
+        raise ValueError(f"Unknown table format {format!r} for {source!r}")
+    for name, artist in rows:
+        if (descriptor := _descriptor(name, artist)) is not None:
+            yield descriptor
@@ -0,0 +1,331 @@
+"""A central scheduler throttling all Spotify API requests.
+
+When requests are made in parallel, 429 ("Too Many Requests") responses cascade:
+every thread backs off (and retries) on its own, without knowing the others are
+being throttled too. `RateLimitScheduler` coordinates them:
+
+- a token bucket caps the request rate (and burst),
+- a ``Retry-After`` received by any request pauses all of them,
+- the number of requests in flight adapts by AIMD (additive increase on success,
+  multiplicative decrease on throttling), as does the rate,
+
+so that batch jobs settle at the highest rate the API sustains.
+
+All pooled clients (see `sung.clients`) and the async transport (see `sung.aio`)
+send their requests through the process-wide ``scheduler``; other ``requests``
+sessions can be routed through it with ``scheduler.install(session)``.
+
+The process-wide ``scheduler`` starts at 10 requests per second and 4 requests in
+flight, and adapts from there (up to 100 per second and 16 in flight). Its starting
+rate and maximum concurrency can be set with the ``SUNG_REQUEST_RATE`` and
+``SUNG_MAX_CONCURRENCY`` environment variables, and any of its settings changed
+while in use with ``scheduler.configure(...)``.
+
+>>> s = RateLimitScheduler(rate=100, max_concurrency=8, initial_concurrency=2)
+>>> with s.slot():
+...     s.metrics()['in_flight']
+1
+>>> s.on_throttled(retry_after=0)
+>>> s.metrics()['throttled'], s.metrics()['concurrency']
+(1, 1.0)
+
+"""
+
+import os
+import asyncio
+import threading
+import time
+from contextlib import contextmanager, asynccontextmanager
+
+DFLT_RATE = 10.0  # requests per second, to start with
+DFLT_MAX_RATE = 100.0  # requests per second the rate can be raised to
+DFLT_BURST = 10
+DFLT_MAX_CONCURRENCY = 16
+DFLT_INITIAL_CONCURRENCY = 4
+DFLT_RETRY_AFTER = 1.0  # seconds, when a 429 doesn't say how long to wait
+DFLT_MAX_THROTTLED_RETRIES = 5
+# Environment variables overriding the process-wide scheduler's defaults
+REQUEST_RATE_ENV_VAR = "SUNG_REQUEST_RATE"
+MAX_CONCURRENCY_ENV_VAR = "SUNG_MAX_CONCURRENCY"
+
+
+def retry_after_seconds(headers, default: float = DFLT_RETRY_AFTER) -> float:
+    """Parse the ``Retry-After`` header (in seconds) of a response.
+
+    >>> retry_after_seconds({'Retry-After': '3'})
+    3.0
+    >>> retry_after_seconds({})
+    1.0
+    """
+    value = (headers or {}).get("Retry-After")
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimitScheduler:
+    """Throttles requests with a token bucket, a global ``Retry-After`` pause and an
+    AIMD-adapted concurrency limit.
+
+    Parameters:
+        - rate: The initial number of requests started per second. It then grows on
+          success (up to ``max_rate``) and shrinks on throttling (down to
+          ``min_rate``), so it finds the rate the API sustains.
+        - burst: How many requests can be started at once after an idle period.
+        - min_concurrency, max_concurrency: Bounds of the concurrency limit.
+        - initial_concurrency: The concurrency limit to start with.
+        - additive_increase: By how much the concurrency limit grows per "round" of
+          successful requests (it grows by ``additive_increase / limit`` per success).
+        - multiplicative_decrease: The factor applied to the concurrency limit (and
+          the rate) when a request is throttled.
+        - min_rate: The rate never goes below this.
+        - max_rate: The rate never goes above this (None for no limit). It's
+          raised to ``rate`` if lower.
+    """
+
+    def __init__(
+        self,
+        rate: float = DFLT_RATE,
+        burst: int = DFLT_BURST,
+        *,
+        min_concurrency: int = 1,
+        max_concurrency: int = DFLT_MAX_CONCURRENCY,
+        initial_concurrency: int = DFLT_INITIAL_CONCURRENCY,
+        additive_increase: float = 1.0,
+        multiplicative_decrease: float = 0.5,
+        min_rate: float = 0.5,
+        max_rate: float | None = DFLT_MAX_RATE,
+        clock=time.monotonic,
+    ):
+        self.max_rate = float("inf") if max_rate is None else max(max_rate, rate)
+        self.rate = rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(
+            min(max(initial_concurrency, min_concurrency), max_concurrency)
+        )
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.clock = clock
+
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._last_refill = clock()
+        self._paused_until = 0.0
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._throttled = 0
+
+    def configure(
+        self,
+        *,
+        rate: float | None = None,
+        burst: int | None = None,
+        min_concurrency: int | None = None,
+        max_concurrency: int | None = None,
+        concurrency: int | None = None,
+        min_rate: float | None = None,
+        max_rate: float | None = ...,
+    ) -> None:
+        """Change the settings of the scheduler (even while in use: everything that
+        holds it sees the change). Settings that aren't given are left as they are.
+        ``rate`` and ``concurrency`` set the current rate and concurrency limit,
+        which then keep adapting, within the (new) bounds.
+
+        >>> s = RateLimitScheduler()
+        >>> s.configure(rate=2, max_concurrency=2)
+        >>> s.metrics()['rate'], s.metrics()['concurrency']
+        (2, 2.0)
+        """
+        with self._cond:
+            if burst is not None:
+                self.burst = burst
+            if min_concurrency is not None:
+                self.min_concurrency = min_concurrency
+            if max_concurrency is not None:
+                self.max_concurrency = max_concurrency
+            if concurrency is not None:
+                self.concurrency = float(concurrency)
+            self.concurrency = float(
+                min(max(self.concurrency, self.min_concurrency), self.max_concurrency)
+            )
+            if min_rate is not None:
+                self.min_rate = min_rate
+            if max_rate is not ...:
+                self.max_rate = float("inf") if max_rate is None else max_rate
+            if rate is not None:
+                self.rate = rate
+                self.max_rate = max(self.max_rate, rate)
+            self.rate = min(max(self.rate, self.min_rate), self.max_rate)
+            self._cond.notify_all()
+
+    # ----------------------------------------------------------------------------------
+    # Acquiring and releasing slots
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._last_refill) * self.rate
+        )
+        self._last_refill = now
+
+    def _try_acquire(self) -> float:
+        """Take a slot if possible, returning 0, or return how long to wait before
+        trying again. Must be called with the condition held."""
+        now = self.clock()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= int(self.concurrency):
+            return float("inf")  # wait for a release
+        self._refill(now)
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+        self._tokens -= 1
+        self._in_flight += 1
+        return 0.0
+
+    def acquire(self) -> None:
+        with self._cond:
+            self._queued += 1
+            try:
+                while (wait := self._try_acquire()) > 0:
+                    self._cond.wait(None if wait == float("inf") else wait)
+            finally:
+                self._queued -= 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._completed += 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """Hold a request slot for the duration of the context."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def aacquire(self) -> None:
+        with self._cond:
+            self._queued += 1
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_acquire()
+                if wait <= 0:
+                    return
+                # Don't block the event loop: poll again a bit later
+                await asyncio.sleep(min(wait, 0.05))
+        finally:
+            with self._cond:
+                self._queued -= 1
+
+    @asynccontextmanager
+    async def aslot(self):
+        """Async counterpart of `slot`."""
+        await self.aacquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    # ----------------------------------------------------------------------------------
+    # Feedback (AIMD)
+
+    def on_success(self) -> None:
+        with self._cond:
+            self.concurrency = min(
+                float(self.max_concurrency),
+                self.concurrency + self.additive_increase / self.concurrency,
+            )
+            self.rate = min(
+                self.max_rate, self.rate + self.additive_increase / self.concurrency
+            )
+            self._cond.notify_all()
+
+    def on_throttled(self, retry_after: float = DFLT_RETRY_AFTER) -> None:
+        """Register a throttled (429) response: pause everyone for ``retry_after``
+        seconds and cut down concurrency and rate."""
+        with self._cond:
+            self._throttled += 1
+            self._paused_until = max(self._paused_until, self.clock() + retry_after)
+            self.concurrency = max(
+                float(self.min_concurrency),
+                self.concurrency * self.multiplicative_decrease,
+            )
+            self.rate = max(self.min_rate, self.rate * self.multiplicative_decrease)
+            self._tokens = min(self._tokens, 0.0)
+            self._cond.notify_all()
+
+    def metrics(self) -> dict:
+        """A snapshot of the scheduler's state and counters."""
+        with self._cond:
+            return {
+                "queued": self._queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "throttled": self._throttled,
+                "concurrency": self.concurrency,
+                "rate": self.rate,
+                "paused_for": max(self._paused_until - self.clock(), 0.0),
+            }
+
+    # ----------------------------------------------------------------------------------
+    # requests integration
+
+    def request(
+        self,
+        send,
+        method,
+        url,
+        *args,
+        max_throttled_retries: int = DFLT_MAX_THROTTLED_RETRIES,
+        **kwargs,
+    ):
+        """Call ``send(method, url, ...)`` (e.g. ``requests.Session.request``) in a
+        slot, retrying (after the global pause) when throttled. Only successful
+        responses count as successes (raising concurrency and rate): errors, such as
+        5xx ones, are returned as they are, without feedback."""
+        for attempt in range(max_throttled_retries + 1):
+            with self.slot():
+                response = send(method, url, *args, **kwargs)
+            if response.status_code != 429:
+                if response.status_code < 400:
+                    self.on_success()
+                return response
+            self.on_throttled(retry_after_seconds(response.headers))
+        return response
+
+    def install(self, session):
+        """Route all requests of a ``requests`` session through this scheduler.
+
+        Note that if the session's adapters retry 429 responses themselves (as the
+        sessions spotipy makes do), those retries are not coordinated: sessions made
+        by `sung.clients.make_pooled_session` with a scheduler leave 429s to it.
+        """
+        send = session.request
+
+        def scheduled_request(method, url, *args, **kwargs):
+            return self.request(send, method, url, *args, **kwargs)
+
+        session.request = scheduled_request
+        return session
+
+
+def _scheduler_settings_from_env() -> dict:
+    settings = {}
+    if rate := os.environ.get(REQUEST_RATE_ENV_VAR):
+        settings["rate"] = float(rate)
+    if max_concurrency := os.environ.get(MAX_CONCURRENCY_ENV_VAR):
+        settings["max_concurrency"] = int(max_concurrency)
+    return settings
+
+
+# The scheduler all pooled clients and async transports use by default
+scheduler = RateLimitScheduler(**_scheduler_settings_from_env())
@@ -0,0 +1,224 @@
+"""A token cache shared by processes, with file locking and refresh-ahead.
+
+Every process that builds its own auth manager gets (or refreshes) its own token.
+With many worker processes, that means many token requests at startup and at each
+expiry, sometimes enough to hit the auth endpoint's rate limits.
+
+`SharedTokenCache` is a spotipy cache handler keeping the token in a file that all
+processes read. Once `synchronize`-d with an auth manager, getting a stale token
+holds an exclusive file lock, so only one process refreshes at a time: the others
+wait, then find the fresh token in the file. Getting a fresh token (what almost all
+requests do) takes no lock, and doesn't even re-read the file unless it changed.
+Tokens are refreshed ``refresh_ahead`` seconds before they expire, so callers don't
+hit expiry in the middle of a job.
+
+The auth managers made by `sung.util.get_spotify_creds` and
+`sung.util.get_spotify_oauth_creds` use a shared cache (and are synchronized with
+it) when given one as ``cache_handler``, or when the ``SUNG_TOKEN_CACHE_DIR``
+environment variable names a directory to keep shared tokens in.
+
+>>> import tempfile
+>>> cache = SharedTokenCache('my_app', rootdir=tempfile.mkdtemp(), refresh_ahead=300)
+>>> cache.get_cached_token() is None
+True
+>>> cache.save_token_to_cache({'access_token': 'abc', 'expires_at': 10_000})
+>>> cache.get_cached_token()['access_token']
+'abc'
+
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from hashlib import sha256
+
+from spotipy.cache_handler import CacheHandler
+
+TOKEN_CACHE_DIR_ENV_VAR = "SUNG_TOKEN_CACHE_DIR"
+DFLT_REFRESH_AHEAD = 300  # seconds
+# spotipy considers tokens expired when they have less than this many seconds left
+_SPOTIPY_EXPIRY_MARGIN = 60
+# Extra seconds a token must have left for the lock-free path to hand it out, so that
+# it can't become stale between our check and its use
+_FAST_PATH_SLACK = 5
+
+
+@contextmanager
+def _locked_file(path: str):
+    """Hold an exclusive lock on the file at ``path`` (blocking until we get it)."""
+    with open(path, "a+") as fp:
+        if os.name == "nt":
+            import msvcrt
+
+            fp.seek(0)
+            msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                fp.seek(0)
+                msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+
+
+class SharedTokenCache(CacheHandler):
+    """A spotipy cache handler whose token file is shared (and locked) across processes.
+
+    Parameters:
+        - key: Names the token (different credentials or scopes need different keys).
+        - rootdir: The directory to keep token (and lock) files in.
+        - refresh_ahead: How many seconds before expiry a token is considered stale,
+          so that it gets refreshed.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        *,
+        rootdir: str | None = None,
+        refresh_ahead: float = DFLT_REFRESH_AHEAD,
+    ):
+        if rootdir is None:
+            rootdir = os.environ.get(TOKEN_CACHE_DIR_ENV_VAR) or os.path.join(
+                os.path.expanduser("~"), ".cache", "sung", "tokens"
+            )
+        os.makedirs(rootdir, exist_ok=True)
+        self.key = key
+        self.rootdir = rootdir
+        self.refresh_ahead = refresh_ahead
+        self.token_path = os.path.join(rootdir, f"{key}.json")
+        self.lock_path = os.path.join(rootdir, f"{key}.lock")
+        # flock locks are per open file, so a thread re-entering the lock it already
+        # holds would deadlock on itself: we track lock depth per thread.
+        self._local = threading.local()
+        # The last token read, with the (mtime, size) of the file it was read from
+        self._last_read = (None, None)
+
+    @classmethod
+    def for_credentials(
+        cls, client_id: str, scope: str | None = None, *, kind: str = "token", **kwargs
+    ):
+        """Make a cache keyed by the kind of auth, the client id and the scope."""
+        scope_hash = sha256((scope or "").encode()).hexdigest()[:12]
+        return cls(f"{kind}-{client_id}-{scope_hash}", **kwargs)
+
+    @contextmanager
+    def lock(self):
+        """Hold the (process and thread) exclusive lock of this token."""
+        depth = getattr(self._local, "depth", 0)
+        if depth:
+            self._local.depth += 1
+            try:
+                yield
+            finally:
+                self._local.depth -= 1
+            return
+        with _locked_file(self.lock_path):
+            self._local.depth = 1
+            try:
+                yield
+            finally:
+                self._local.depth = 0
+
+    def _read_token(self):
+        """The token in the file, re-read only if the file changed.
+
+        No lock is needed: the file is only ever replaced whole (see
+        `save_token_to_cache`), so readers see either the old or the new token.
+        """
+        try:
+            stat = os.stat(self.token_path)
+        except OSError:
+            return None
+        file_version = (stat.st_mtime_ns, stat.st_size)
+        read_version, token_info = self._last_read
+        if read_version != file_version:
+            try:
+                with open(self.token_path) as fp:
+                    token_info = json.load(fp)
+            except (OSError, ValueError):
+                return None
+            self._last_read = (file_version, token_info)
+        return token_info
+
+    def get_cached_token(self):
+        token_info = self._read_token()
+        if token_info is None:
+            return None
+        if self.refresh_ahead and "expires_at" in token_info:
+            # Make spotipy see the token as expiring refresh_ahead seconds earlier
+            token_info = dict(
+                token_info,
+                expires_at=token_info["expires_at"]
+                - max(self.refresh_ahead - _SPOTIPY_EXPIRY_MARGIN, 0),
+            )
+        return token_info
+
+    def save_token_to_cache(self, token_info):
+        with self.lock():
+            tmp_path = f"{self.token_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as fp:
+                json.dump(token_info, fp)
+            os.replace(tmp_path, self.token_path)
+
+    def _fresh_access_token(self) -> str | None:
+        """The cached access token, if it's far from stale (else None)."""
+        token_info = self.get_cached_token()
+        if not token_info or "expires_at" not in token_info:
+            return None
+        time_left = token_info["expires_at"] - time.time()
+        if time_left <= _SPOTIPY_EXPIRY_MARGIN + _FAST_PATH_SLACK:
+            return None
+        return token_info.get("access_token")
+
+    def synchronize(self, auth_manager):
+        """Make ``auth_manager`` get stale tokens under this cache's lock.
+
+        So when many processes find the token stale at the same time, only the first
+        one refreshes it; the others then read the refreshed token from the cache.
+        While the token is fresh, it's handed out without taking the lock (the
+        lock is taken, and the token checked again, only when it looks stale).
+        Returns the (modified in place) auth manager.
+        """
+        get_access_token = auth_manager.get_access_token
+
+        @wraps(get_access_token)
+        def locked_get_access_token(*args, **kwargs):
+            # Fast path: what spotipy clients ask for, before each request
+            if not args and kwargs.get("as_dict") is False and len(kwargs) == 1:
+                if (access_token := self._fresh_access_token()) is not None:
+                    return access_token
+            with self.lock():
+                return get_access_token(*args, **kwargs)
+
+        auth_manager.get_access_token = locked_get_access_token
+        return auth_manager
+
+
+def shared_token_cache_for(
+    auth_kwargs: dict, client_id: str, *, kind: str
+) -> SharedTokenCache | None:
+    """The shared token cache auth managers with ``auth_kwargs`` should use, if any.
+
+    That's the ``cache_handler`` of ``auth_kwargs`` if it's a `SharedTokenCache`,
+    or, if no cache handler (or cache path) was asked for and the
+    ``SUNG_TOKEN_CACHE_DIR`` environment variable is set, a new one in that directory.
+    """
+    cache_handler = auth_kwargs.get("cache_handler")
+    if isinstance(cache_handler, SharedTokenCache):
+        return cache_handler
+    if cache_handler is None and not auth_kwargs.get("cache_path"):
+        if os.environ.get(TOKEN_CACHE_DIR_ENV_VAR):
+            return SharedTokenCache.for_credentials(
+                client_id, auth_kwargs.get("scope"), kind=kind
+            )
+    return None
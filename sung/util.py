@@ -27,6 +27,8 @@ from i2 import Sig
 from spotipy import Spotify
 from spotipy.oauth2 import SpotifyClientCredentials, SpotifyOAuth
 
+from sung.tokens import shared_token_cache_for
+
 DFLT_LIMIT = 20
 
 # TODO: Get automatically from pydantic model when available
@@ -131,24 +133,33 @@ def pop_client_id_and_secret(kwargs) -> tuple[str, str]:
     return client_id, client_secret
 
 
-def get_spotify_creds(**client_creds_kwargs) -> SpotifyClientCredentials:
-    client_id, client_secret = pop_client_id_and_secret(client_creds_kwargs)
-    return SpotifyClientCredentials(
+def _with_shared_token_cache(auth_manager_cls, auth_kwargs, *, kind):
+    """Make an auth manager, using (and synchronizing with) a shared token cache
+    if one is given or configured (see `sung.tokens`)."""
+    client_id, client_secret = pop_client_id_and_secret(auth_kwargs)
+    token_cache = shared_token_cache_for(auth_kwargs, client_id, kind=kind)
+    if token_cache is not None:
+        auth_kwargs["cache_handler"] = token_cache
+    auth_manager = auth_manager_cls(
         client_id=client_id,
         client_secret=client_secret,
-        **client_creds_kwargs,
+        **auth_kwargs,
     )
+    if token_cache is not None:
+        token_cache.synchronize(auth_manager)
+    return auth_manager
 
 
-def get_spotify_oauth_creds(**oauth_kwargs) -> SpotifyOAuth:
-    client_id, client_secret = pop_client_id_and_secret(oauth_kwargs)
-    return SpotifyOAuth(
-        client_id=client_id,
-        client_secret=client_secret,
-        **oauth_kwargs,
+def get_spotify_creds(**client_creds_kwargs) -> SpotifyClientCredentials:
+    return _with_shared_token_cache(
+        SpotifyClientCredentials, client_creds_kwargs, kind="client_credentials"
     )
 
 
+def get_spotify_oauth_creds(**oauth_kwargs) -> SpotifyOAuth:
+    return _with_shared_token_cache(SpotifyOAuth, oauth_kwargs, kind="oauth")
+
+
 def _extract_scope_items(scope_string: str) -> Iterable[str]:
     if isinstance(scope_string, str):
         return re.findall(r"\S+", scope_string)
@@ -221,7 +232,7 @@ def get_spotify_client(client=None, *, ensure_scope="", scope="", **kwargs) -> S
     scope desires.
 
     """
-    scope = _add_to_scope(kwargs.get("scope", ""), ensure_scope)
+    scope = _add_to_scope(scope, ensure_scope)
     kwargs["scope"] = scope
 
     spotify_kwargs = Sig(Spotify).map_arguments(
@@ -486,8 +497,15 @@ spotify_audio_features_fields_with_0_to_1_range = [
 
 
 def ensure_client(client=None) -> Spotify:
-    if client is None:
-        return get_spotify_client()
+    """Get a Spotify client from a client, a client factory, or None.
+
+    ``None`` and the default `get_spotify_client` factory give the process-wide
+    pooled client (see `sung.clients`), instead of building a new one every time.
+    """
+    if client is None or client is get_spotify_client:
+        from sung.clients import pooled_client
+
+        return pooled_client()
     if callable(client):
         client_factory = client
         client = client_factory()